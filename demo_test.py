@@ -1,6 +1,7 @@
+import os
+
 from telegram_menu import BaseMessage, TelegramMenuSession, NavigationHandler
 
-API_KEY = "8182446297:AAFVGVfi12xhxDaqxpUPkHPPTxy5A5Cnmz4"
 
 class StartMessage(BaseMessage):
     """Start menu, create all app sub-menus."""
@@ -15,33 +16,20 @@ class StartMessage(BaseMessage):
         """Update message content."""
         return "Hello, world!"
 
-TelegramMenuSession(API_KEY).start(StartMessage)
-
-
-
-# import logging
-# from telegram import Update
-# from telegram.ext import Application, ApplicationBuilder, ContextTypes, CommandHandler
-
 
-# logging.basicConfig(
-#     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-#     level=logging.INFO
-# )
+if __name__ == "__main__":
+    API_KEY = os.environ["TELEGRAM_BOT_TOKEN"]
 
-# async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-#     await context.bot.send_message(chat_id=update.effective_chat.id, text="I'm a bot, please talk to me!")
+    # webhook mode is used when WEBHOOK_URL is set, long-polling otherwise
+    WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "")
+    LISTEN = os.environ.get("LISTEN", "0.0.0.0")
+    PORT = int(os.environ.get("PORT", "8443"))
 
-# if __name__ == '__main__':
-#     # application = ApplicationBuilder().token(API_KEY).build()
-#     application = Application.builder().token(API_KEY).build()
-    
-#     scheduler = application.job_queue.scheduler
-#     start_handler = CommandHandler('start', start)
-#     application.add_handler(start_handler)
-    
-#     application.run_polling()
-#     print(scheduler.__dict__)
-#     scheduler.start()
-    
-    
\ No newline at end of file
+    session = TelegramMenuSession(API_KEY)
+    if WEBHOOK_URL:
+        session.start(StartMessage, polling=False)
+        session.application.run_webhook(
+            listen=LISTEN, port=PORT, url_path=API_KEY, webhook_url=f"{WEBHOOK_URL}/{API_KEY}"
+        )
+    else:
+        session.start(StartMessage)
@@ -18,7 +18,7 @@
 
 """Telegram interfaces."""
 
-from .models import BaseMessage, ButtonType, MenuButton
+from .models import BaseMessage, ButtonType, MenuButton, async_partial
 from .navigation import NavigationException, NavigationHandler, TelegramMenuSession
 
 __all__ = [
@@ -28,4 +28,5 @@ __all__ = [
     "ButtonType",
     "MenuButton",
     "NavigationException",
+    "async_partial",
 ]
@@ -58,6 +58,19 @@ async def call_function_EAFP(method: TypeCallback, par: Any, *args: Any, **kwarg
             return method(*args, **kwargs)  # type: ignore
 
 
+def async_partial(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Bind arguments to an async callback, like functools.partial, and keep the result a coroutine function.
+
+    call_function_EAFP awaits a callback only if asyncio.iscoroutinefunction() detects it, which is not the case
+    for a functools.partial of a bound async method before python 3.10.
+    """
+
+    async def _callback(*call_args: Any, **call_kwargs: Any) -> Any:
+        return await method(*args, *call_args, **{**kwargs, **call_kwargs})
+
+    return _callback
+
+
 class ButtonType(Enum):
     """Button type enumeration."""
 
@@ -56,6 +56,10 @@ class TelegramMenuSession:
     # delays in seconds
     READ_TIMEOUT = 6
     CONNECT_TIMEOUT = 7
+    POOL_TIMEOUT = 10.0
+
+    # shared keep-alive HTTPX pool used by the bot for all requests (menus, notifications, ...)
+    CONNECTION_POOL_SIZE = 32
     START_MESSAGE = "start"
 
     def __init__(self, api_key: str, start_message: str = START_MESSAGE, persistence_path: str = "") -> None:
@@ -70,7 +74,13 @@ class TelegramMenuSession:
 
         persistence = PicklePersistence(filepath=persistence_path if persistence_path else "arbitrarycallbackdatabot")
         self.application = (
-            Application.builder().token(api_key).persistence(persistence).arbitrary_callback_data(True).build()
+            Application.builder()
+            .token(api_key)
+            .persistence(persistence)
+            .arbitrary_callback_data(True)
+            .connection_pool_size(self.CONNECTION_POOL_SIZE)
+            .pool_timeout(self.POOL_TIMEOUT)
+            .build()
         )
         self.scheduler = self.application.job_queue.scheduler  # type: ignore
 
@@ -241,7 +251,8 @@ class NavigationHandler:
 
     POLL_DEADLINE = 20  # seconds
     MESSAGE_CHECK_TIMEOUT = 120  # seconds
-    CONNECTION_POOL_SIZE = 8
+    # all handlers share the pool of the session's bot, see TelegramMenuSession.CONNECTION_POOL_SIZE
+    CONNECTION_POOL_SIZE = TelegramMenuSession.CONNECTION_POOL_SIZE
 
     def __init__(self, bot: Bot, chat: Chat, scheduler: BaseScheduler) -> None:
         """Init NavigationHandler class."""
@@ -323,6 +334,17 @@ class NavigationHandler:
             menu_previous = self._menu_queue.pop()
         return await self.goto_menu(menu_previous, context)
 
+    async def open_message(
+        self, message: BaseMessage, label: str, context: Optional[CallbackContext[BT, UD, CD, BD]] = None
+    ) -> int:
+        """Open a message the same way a button with this message as callback does."""
+        if not message.inlined:
+            return await self.goto_menu(message, context)
+        msg_id = await self._send_app_message(message, label, context)
+        if message.home_after:
+            msg_id = await self.goto_home(context)
+        return msg_id
+
     @staticmethod
     def filter_unicode(input_string: str) -> str:
         """Remove non-unicode characters from input string."""
@@ -447,12 +469,7 @@ class NavigationHandler:
             if not btn:
                 continue
             if isinstance(btn.callback, BaseMessage):
-                if btn.callback.inlined:
-                    msg_id = await self._send_app_message(btn.callback, label, context)
-                    if btn.callback.home_after:
-                        msg_id = await self.goto_home(context)
-                else:
-                    msg_id = await self.goto_menu(btn.callback, context)
+                msg_id = await self.open_message(btn.callback, label, context)
             elif btn.callback is not None and hasattr(btn.callback, "__call__"):
                 if btn.args is not None:
                     await call_function_EAFP(btn.callback, context, btn.args)
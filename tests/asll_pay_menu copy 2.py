@@ -4,31 +4,123 @@
 # Generated to implement full services menu for اصل‌پی with update_callback support
 
 import os
+import sys
+import types
+import asyncio
+import collections
 import datetime
+import functools
 import logging
 from logging import Logger
 from pathlib import Path
-from typing import Any, Callable, Coroutine, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, Final, List, Mapping, Optional, Tuple
 
-from telegram import InlineKeyboardMarkup, Message, ReplyKeyboardMarkup
+from telegram_menu import BaseMessage, NavigationHandler, async_partial
 
+ROOT_FOLDER = Path(__file__).parent
+_RESOURCES_PATH: Path = ROOT_FOLDER.parent / "resources"
+
+# برچسب‌های مشترک دکمه‌ها؛ همه‌ی منوها به همین یک شیء اشاره می‌کنند
+_BACK = sys.intern("⬅️ بازگشت")
+_HOME = sys.intern("🏠 خانه")
+
+# ========= Products =========
+# key = نام فایل در resources / display = عنوانی که کاربر می‌بینه
+_GIFT_PRODUCTS: Tuple[Tuple[str, str], ...] = (
+    ("apple_gift", "Apple Gift Card"),
+    ("google_play", "Google Play"),
+    ("playstation", "PlayStation"),
+    # ("xbox", "Xbox"),
+    # ("steam", "Steam"),
+    ("prepaid_card", "Prepaid Master/Visa"),
+)
+
+_ACCOUNTS: Tuple[Tuple[str, str], ...] = (
+    ("paypal", "PayPal"),
+    ("wirex", "Wirex"),
+    ("mastercard", "MasterCard 🇹🇷"),
+    ("wise", "Wise (TransferWise)"),
+)
+
+_PAYMENTS: Tuple[Tuple[str, str], ...] = (
+    ("university_fee", "پرداخت شهریه دانشگاه"),
+    ("saas_purchase", "خرید سرویس‌های SaaS"),
+    ("flight_hotel", "بلیط هواپیما / هتل"),
+    ("fx_to_rial", "تبدیل درآمد ارزی به ریال"),
+)
+
+
+_FALLBACK_TEXT = "جزئیات به زودی اضافه می‌شود."
+
+# فهرست فایل‌های resources با یک بار خواندن پوشه؛ برای فایل‌های ناموجود اصلاً open صدا زده نمی‌شود
 try:
-    from typing_extensions import TypedDict
-except ImportError:
-    from typing import TypedDict
+    with os.scandir(_RESOURCES_PATH) as _entries:
+        _RESOURCE_INDEX: Dict[str, str] = {e.name: e.path for e in _entries if e.is_file()}
+except FileNotFoundError:
+    _RESOURCE_INDEX = {}
 
-from telegram.ext._callbackcontext import CallbackContext
-from telegram.ext._utils.types import BD, BT, CD, UD
 
-import telegram_menu
-from telegram_menu import BaseMessage, ButtonType, MenuButton, NavigationHandler, TelegramMenuSession
+@functools.lru_cache(maxsize=None)
+def _load_resource(file_name: str) -> str:
+    """خواندن متن از فایل در resources؛ هر فایل فقط یک بار در طول اجرای ربات خوانده می‌شود"""
+    file_path = _RESOURCE_INDEX.get(file_name)
+    if file_path is None:
+        return _FALLBACK_TEXT
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _build_texts(products: Tuple[Tuple[str, str], ...]) -> Mapping[str, Tuple[str, str]]:
+    """عنوان محصول → (توضیح، جزئیات)؛ فایل‌ها مثلا apple_gift_desc.txt و apple_gift_details.txt
+
+    جدول فقط‌خواندنی است چون بین همه‌ی sessionها مشترک است.
+    """
+    return types.MappingProxyType({
+        display_name: (_load_resource(f"{key}_desc.txt"), _load_resource(f"{key}_details.txt"))
+        for key, display_name in products
+    })
+
+
+# متن محصولات یک بار هنگام import خوانده می‌شود، قبل از اینکه event loop شروع شود
+_GIFT_TEXTS = _build_texts(_GIFT_PRODUCTS)
+_ACCOUNT_TEXTS = _build_texts(_ACCOUNTS)
+_PAYMENT_TEXTS = _build_texts(_PAYMENTS)
 
-ROOT_FOLDER = Path(__file__).parent
 
-UnitTestDict = TypedDict("UnitTestDict", {"description": str, "input": str, "output": str})
-TypePackageLogger = TypedDict("TypePackageLogger", {"package": str, "level": int})
+class _RateLimiter:
+    """محدودکننده‌ی نرخ: حداکثر max_rate ورود در هر period ثانیه (بقیه صبر می‌کنند)"""
+
+    def __init__(self, max_rate: int, period: float = 1.0) -> None:
+        self._max_rate = max_rate
+        self._period = period
+        self._stamps: Deque[float] = collections.deque()
+
+    async def __aenter__(self) -> "_RateLimiter":
+        # بررسی و ثبت بین دو await انجام می‌شود پس lock لازم نیست؛ منتظرها در حین sleep چیزی نگه نمی‌دارند
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self._stamps and now - self._stamps[0] >= self._period:
+                self._stamps.popleft()
+            if len(self._stamps) < self._max_rate:
+                self._stamps.append(now)
+                return self
+            await asyncio.sleep(self._period - (now - self._stamps[0]))
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
 
 class MyNavigationHandler(NavigationHandler):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # bound methodها یک بار برای هر session ساخته می‌شوند و همه‌ی دکمه‌ها از همین‌ها استفاده می‌کنند
+        self._back = self.goto_back
+        self._home = self.goto_home
+        # سقف ~۱ ویرایش در ثانیه برای همین چت؛ همراه session از بین می‌رود.
+        # سقف کل ربات (~۳۰ پیام در ثانیه) کار Application است که TelegramMenuSession می‌سازد، نه یک limiter سراسری
+        self._edit_limiter = _RateLimiter(1, 1.0)
+
     # async def goto_back(self) -> int:
     #     return await self.select_menu_button("⬅️ بازگشت")
     
@@ -37,6 +129,50 @@ class MyNavigationHandler(NavigationHandler):
         return await self.select_menu_button("Back")
 
 
+class _AsllBaseMessage(BaseMessage):
+    """پیام پایه‌ی منوهای اصل‌پی با رفرش مشترک برای update_callback"""
+
+    # متن ثابت هر منو؛ زیرکلاس‌هایی که متن پویا دارند update را override می‌کنند
+    _UPDATE_TEXT = ""
+
+    def update(self) -> str:
+        return self._UPDATE_TEXT
+
+    async def app_update_display(self) -> None:
+        """Update message content when callback triggered."""
+        async with self.navigation._edit_limiter:
+            edited = await self.edit_message()
+        if edited:
+            self.is_alive()
+
+    def _register(self, update_callback: List[Callable]) -> None:
+        update_callback.append(self.app_update_display)
+
+
+class _NavTail:
+    """دکمه‌های مشترک «بازگشت» و «خانه» در انتهای هر منو + ثبت update_callback"""
+
+    # (برچسب، نام bound method روی MyNavigationHandler)
+    _NAV_BUTTONS = ((_BACK, "_back"), (_HOME, "_home"))
+
+    def _add_nav(self, navigation: MyNavigationHandler, update_callback: List[Callable]) -> None:
+        for label, attr in self._NAV_BUTTONS:
+            self.add_button(label=label, callback=getattr(navigation, attr))
+        self._register(update_callback)
+
+
+class _LazySubmenus:
+    """زیرمنوها با اولین کلیک ساخته و برای همان session نگه داشته می‌شوند"""
+
+    async def _open_submenu(self, menu_class: type, context: Optional[Any] = None) -> int:
+        """Build the sub-menu on first use and navigate to it."""
+        menu = self._submenu_cache.get(menu_class)
+        if menu is None:
+            menu = menu_class(self.navigation, self._update_callback)
+            self._submenu_cache[menu_class] = menu
+        return await self.navigation.goto_menu(menu, context)
+
+
 class ActionAppMessage(BaseMessage):
     """Single action message."""
 
@@ -51,267 +187,129 @@ class ActionAppMessage(BaseMessage):
             inlined=True,
         )
         self.shared_content = shared_content
+        self._rendered: str = shared_content or "تعریف نشده"
 
     def update(self) -> str:
         """Update message content."""
-        content = self.shared_content or "تعریف نشده"
-        return f"{content}"
+        return self._rendered
 
 
-class ProductDetailMessage(BaseMessage):
+class ProductDetailMessage(_AsllBaseMessage, _NavTail):
     """نمایش جزئیات یک محصول / سرویس به همراه دکمه سفارش"""
 
-    def __init__(self, navigation: MyNavigationHandler, title: str, description: str, details: Optional[str] = None, update_callback: Optional[List[Callable]] = None):
+    def __init__(self, navigation: MyNavigationHandler, title: str, description: str, update_callback: List[Callable], details: Optional[str] = None):
         label = f"detail:{title}"
         super().__init__(navigation, label, notification=True)
         self.title = title
         self.description = description
-        self.sample_price = None
+        self._sample_price = None
+        # متن پیام فقط وقتی sample_price عوض شود دوباره ساخته می‌شود؛ update فقط آن را برمی‌گرداند
+        self._rendered = self._render()
 
         # دکمه‌ها: سفارش، بازگشت، خانه
         self.add_button(label="🛒 سفارش", callback=self.action_order)
         self.add_button(label="اطلاعات تکمیلی", callback=ActionAppMessage(navigation, details))
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation, update_callback)
 
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
+    @property
+    def sample_price(self) -> Optional[str]:
+        return self._sample_price
 
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
+    @sample_price.setter
+    def sample_price(self, value: Optional[str]) -> None:
+        self._sample_price = value
+        self._rendered = self._render()
+
+    def _render(self) -> str:
+        return "".join([
+            "<b>", self.title, "</b>\n\n", self.description, "\n",
+            f"\n<b>قیمت تقریبی:</b> {self._sample_price}\n" if self._sample_price else "",
+            "\nبرای سفارش دکمه '🛒 سفارش' را بزنید.",
+        ])
 
     def update(self) -> str:
-        out = f"<b>{self.title}</b>\n\n{self.description}\n"
-        if self.sample_price:
-            out += f"\n<b>قیمت تقریبی:</b> {self.sample_price}\n"
-        out += "\nبرای سفارش دکمه '🛒 سفارش' را بزنید."
-        return out
+        return self._rendered
 
     def action_order(self, *args):
         return f"سفارش برای '{self.title}' ثبت شد. لطفاً اطلاعات پرداخت را ارسال کنید یا با پشتیبانی تماس بگیرید."
 
 
-class GiftCardsMenuMessage(BaseMessage):
-    LABEL = "💳 گیفت‌کارت‌ها"
-
-    def __init__(self, navigation: MyNavigationHandler, update_callback: Optional[List[Callable]] = None):
-        super().__init__(navigation, GiftCardsMenuMessage.LABEL, notification=False)
-
-        resources_path = os.path.join(Path(ROOT_FOLDER).parent, "resources")
+class _CatalogMenu(_AsllBaseMessage, _NavTail):
+    """منوی فهرست محصولات؛ زیرکلاس‌ها فقط LABEL، جدول متن‌ها و متن سرصفحه را تعیین می‌کنند"""
 
-        # محصولات: key = نام فایل / display = عنوانی که کاربر می‌بینه
-        products = {
-            "apple_gift": "Apple Gift Card",
-            "google_play": "Google Play",
-            "playstation": "PlayStation",
-            # "xbox": "Xbox",
-            # "steam": "Steam",
-            "prepaid_card": "Prepaid Master/Visa"
-        }
+    LABEL = ""
+    _TEXTS: Mapping[str, Tuple[str, str]] = types.MappingProxyType({})
 
-        def load_text(file_name: str) -> str:
-            """خواندن متن از فایل در resources"""
-            file_path = os.path.join(resources_path, file_name)
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return f.read().strip()
-            return "جزئیات به زودی اضافه می‌شود."
-
-        for key, display_name in products.items():
-            # فایل‌ها: مثلا apple_gift_desc.txt و apple_gift_details.txt
-            desc = load_text(f"{key}_desc.txt")
-            details = load_text(f"{key}_details.txt")
+    def __init__(self, navigation: MyNavigationHandler, update_callback: List[Callable]):
+        super().__init__(navigation, self.LABEL, notification=False)
+        self._update_callback = update_callback
+        # صفحه جزئیات فقط با اولین کلیک ساخته می‌شود
+        self._detail_cache: Dict[str, ProductDetailMessage] = {}
 
+        for display_name in self._TEXTS:
             self.add_button(
                 label=display_name,  # اسم محصول که کاربر می‌بینه
-                callback=ProductDetailMessage(
-                    navigation,
-                    display_name,  # عنوانی که وارد صفحه جزئیات میشه
-                    desc,
-                    details,
-                    update_callback  # price حذف شد
-                )
+                callback=async_partial(self._open_detail, display_name),
             )
 
+        self._add_nav(navigation, update_callback)
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
-
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
+    async def _open_detail(self, title: str, context: Optional[Any] = None) -> int:
+        """Build the product detail page on first use and navigate to it."""
+        detail = self._detail_cache.get(title)
+        if detail is None:
+            desc, details = self._TEXTS[title]
+            detail = ProductDetailMessage(self.navigation, title, desc, self._update_callback, details)
+            self._detail_cache[title] = detail
+        return await self.navigation.goto_menu(detail, context)
 
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
-
-    def update(self) -> str:
-        return "یکی از گیفت‌کارت‌های زیر را انتخاب کنید:"
 
+class GiftCardsMenuMessage(_CatalogMenu):
+    LABEL = sys.intern("💳 گیفت‌کارت‌ها")
+    _TEXTS = _GIFT_TEXTS
+    _UPDATE_TEXT = sys.intern("یکی از گیفت‌کارت‌های زیر را انتخاب کنید:")
 
-class AccountsMenuMessage(BaseMessage):
-    LABEL = "🏦 حساب‌های بین‌المللی"
 
-    def __init__(self, navigation: MyNavigationHandler, update_callback: Optional[List[Callable]] = None):
-        super().__init__(navigation, AccountsMenuMessage.LABEL, notification=False)
+class AccountsMenuMessage(_CatalogMenu):
+    LABEL = sys.intern("🏦 حساب‌های بین‌المللی")
+    _TEXTS = _ACCOUNT_TEXTS
+    _UPDATE_TEXT = sys.intern("کدام نوع حساب بین‌المللی را می‌خواهید؟")
 
-        resources_path = os.path.join(Path(ROOT_FOLDER).parent, "resources")
 
-        # لیست اکانت‌ها: key = نام فایل / display = عنوان منو
-        accounts = {
-            "paypal": "PayPal",
-            "wirex": "Wirex",
-            "mastercard": "MasterCard 🇹🇷",
-            "wise": "Wise (TransferWise)"
-        }
-
-        def load_text(file_name: str) -> str:
-            """خواندن متن از فایل در resources"""
-            file_path = os.path.join(resources_path, file_name)
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return f.read().strip()
-            return "جزئیات به زودی اضافه می‌شود."
-
-        for key, display_name in accounts.items():
-            # فایل‌ها: مثلا paypal_desc.txt و paypal_details.txt
-            desc = load_text(f"{key}_desc.txt")
-            details = load_text(f"{key}_details.txt")
-
-            self.add_button(
-                label=display_name,  # چیزی که کاربر می‌بینه
-                callback=ProductDetailMessage(
-                    navigation,
-                    display_name,   # عنوانی که به صفحه جزئیات میره
-                    desc,
-                    details,
-                    update_callback,  # price حذف شد
-                )
-            )
-
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
-
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
-
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
-
-    def update(self) -> str:
-        return "کدام نوع حساب بین‌المللی را می‌خواهید؟"
+class PaymentsMenuMessage(_CatalogMenu):
+    LABEL = sys.intern("💵 پرداخت‌های ارزی")
+    _TEXTS = _PAYMENT_TEXTS
+    _UPDATE_TEXT = sys.intern("نوع پرداخت ارزی خود را انتخاب کنید:")
 
 
-class PaymentsMenuMessage(BaseMessage):
-    LABEL = "💵 پرداخت‌های ارزی"
+class ServicesMenuMessage(_AsllBaseMessage, _NavTail, _LazySubmenus):
+    LABEL = sys.intern("خدمات ما 🛠️")
+    _UPDATE_TEXT = sys.intern("خدمات اصلی اصل‌پی را ببینید:")
 
-    def __init__(self, navigation: MyNavigationHandler, update_callback: Optional[List[Callable]] = None):
-        super().__init__(navigation, PaymentsMenuMessage.LABEL, notification=False)
-
-
-        resources_path = os.path.join(Path(ROOT_FOLDER).parent, "resources")
-
-        # کلید = نام فایل / نمایش‌نام = چیزی که توی منو نشون داده میشه
-        payments = {
-            "university_fee": "پرداخت شهریه دانشگاه",
-            "saas_purchase": "خرید سرویس‌های SaaS",
-            "flight_hotel": "بلیط هواپیما / هتل",
-            "fx_to_rial": "تبدیل درآمد ارزی به ریال"
-        }
-
-        def load_text(file_name: str) -> str:
-            """خواندن متن از فایل در resources"""
-            file_path = os.path.join(resources_path, file_name)
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return f.read().strip()
-            return "جزئیات به زودی اضافه می‌شود."
-
-        for key, display_name in payments.items():
-            # فایل‌ها: مثلا university_fee_desc.txt و university_fee_details.txt
-            desc = load_text(f"{key}_desc.txt")
-            details = load_text(f"{key}_details.txt")
-
-            self.add_button(
-                label=display_name,
-                callback=ProductDetailMessage(
-                    navigation,
-                    display_name,  # عنوانی که وارد صفحه جزئیات میشه
-                    desc,
-                    details,
-                    update_callback  # price حذف شد
-                )
-            )
-
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
-
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
-
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
-
-    def update(self) -> str:
-        return "نوع پرداخت ارزی خود را انتخاب کنید:"
-
-
-class ServicesMenuMessage(BaseMessage):
-    LABEL = "خدمات ما 🛠️"
-
-    def __init__(self, navigation: MyNavigationHandler, update_callback: Optional[List[Callable]] = None):
+    def __init__(self, navigation: MyNavigationHandler, update_callback: List[Callable]):
         super().__init__(navigation, ServicesMenuMessage.LABEL, notification=False)
 
-        gift_card = GiftCardsMenuMessage(navigation, update_callback)
-        accounts = AccountsMenuMessage(navigation, update_callback)
-        payments = PaymentsMenuMessage(navigation, update_callback)
+        # زیرمنوها فقط با اولین کلیک ساخته می‌شوند
+        self._update_callback = update_callback
+        self._submenu_cache: Dict[type, BaseMessage] = {}
 
-        self.add_button(label="💳 گیفت‌کارت‌ها", callback=gift_card)
-        self.add_button(label="🏦 حساب‌های بین‌المللی", callback=accounts)
-        self.add_button(label="💵 پرداخت‌های ارزی", callback=payments)
-        self.add_button(label="✨ خدمات ویژه",callback=ProductDetailMessage(navigation,"خدمات ویژه","تبدیل درآمد، کارت مجازی و خدمات اختصاصی.","جزئیات خدمات ویژه به زودی اضافه می‌شود.",update_callback))
+        self.add_button(label=GiftCardsMenuMessage.LABEL, callback=async_partial(self._open_submenu, GiftCardsMenuMessage))
+        self.add_button(label=AccountsMenuMessage.LABEL, callback=async_partial(self._open_submenu, AccountsMenuMessage))
+        self.add_button(label=PaymentsMenuMessage.LABEL, callback=async_partial(self._open_submenu, PaymentsMenuMessage))
+        self.add_button(label="✨ خدمات ویژه",callback=ProductDetailMessage(navigation,"خدمات ویژه","تبدیل درآمد، کارت مجازی و خدمات اختصاصی.",update_callback,"جزئیات خدمات ویژه به زودی اضافه می‌شود."))
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation, update_callback)
 
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
 
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
-
-    def update(self) -> str:
-        return "خدمات اصلی اصل‌پی را ببینید:" 
+class LearningMenuMessage(_AsllBaseMessage, _NavTail):
+    LABEL = sys.intern("آموزش و راهنما 📚")
+    _UPDATE_TEXT = sys.intern("راهنماها و نکات امنیتی را مطالعه کنید.")
 
-
-class LearningMenuMessage(BaseMessage):
-    LABEL = "آموزش و راهنما 📚"
-
-    def __init__(self, navigation: MyNavigationHandler, update_callback: Optional[List[Callable]] = None):
+    def __init__(self, navigation: MyNavigationHandler, update_callback: List[Callable]):
         super().__init__(navigation, LearningMenuMessage.LABEL, notification=False)
         self.add_button(label="آموزش خرید", callback=self.action_buy_guide)
         self.add_button(label="آموزش امنیت", callback=self.action_security_guide)
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
-
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
-
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
-
-    def update(self) -> str:
-        return "راهنماها و نکات امنیتی را مطالعه کنید."
+        self._add_nav(navigation, update_callback)
 
     def action_buy_guide(self, *args):
         return self.notify("برای خرید: سرویس موردنظر را انتخاب کنید → ثبت سفارش → ارسال اطلاعات پرداخت.")
@@ -320,26 +318,15 @@ class LearningMenuMessage(BaseMessage):
         return self.notify("نکته امنیتی: هرگز اطلاعات کامل کارت یا رمز یک‌‌بارمصرف را در چت عمومی ارسال نکنید.")
 
 
-class ContactMenuMessage(BaseMessage):
-    LABEL = "پشتیبانی 👤"
+class ContactMenuMessage(_AsllBaseMessage, _NavTail):
+    LABEL = sys.intern("پشتیبانی 👤")
+    _UPDATE_TEXT = sys.intern("راه‌های ارتباط با پشتیبانی را انتخاب کنید.")
 
-    def __init__(self, navigation: MyNavigationHandler, update_callback: Optional[List[Callable]] = None):
+    def __init__(self, navigation: MyNavigationHandler, update_callback: List[Callable]):
         super().__init__(navigation, ContactMenuMessage.LABEL, notification=False)
         self.add_button(label="ارسال پیام به پشتیبانی", callback=self.action_contact)
         self.add_button(label="تماس ادمین", callback=self.action_admin)
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
-
-        if isinstance(update_callback, list):
-            update_callback.append(self.app_update_display)
-
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
-
-    def update(self) -> str:
-        return "راه‌های ارتباط با پشتیبانی را انتخاب کنید."
+        self._add_nav(navigation, update_callback)
 
     def action_contact(self, *args):
         return self.notify("پیام شما به پشتیبانی ارسال شد. در ساعات کاری ظرف چند ساعت پاسخ خواهیم داد.")
@@ -348,46 +335,78 @@ class ContactMenuMessage(BaseMessage):
         return self.notify("برای تماس فوری: @AsllPayAdmin")
 
 
-class StartMessage(BaseMessage):
+class StartMessage(_AsllBaseMessage, _LazySubmenus):
     LABEL = "start"
+    _UPDATE_TEXT = sys.intern("🌍💳 Asll Pay | اصل پی 💳🌍\n\nبه ربات اصل‌پی خوش‌آمدید!\nخدمات را از منوی زیر انتخاب کنید.")
 
     def __init__(self, navigation: MyNavigationHandler, message_args: Optional[List[Callable]] = None) -> None:
         super().__init__(navigation, StartMessage.LABEL)
-        services = ServicesMenuMessage(navigation, message_args)
-        learning = LearningMenuMessage(navigation, message_args)
-        contact = ContactMenuMessage(navigation, message_args)
+        # اگر TelegramMenuSession لیستی نداده باشد، منوها در یک لیست محلی ثبت می‌شوند
+        if message_args is None:
+            message_args = []
+        self._update_callback = message_args
+        self._submenu_cache: Dict[type, BaseMessage] = {}
 
-        self.add_button(label="آموزش و راهنما 📚", callback=learning)
-        self.add_button(label="خدمات ما 🛠️", callback=services)
-        self.add_button(label="پشتیبانی 👤", callback=contact)
+        # هیچ زیرمنویی اینجا ساخته نمی‌شود؛ هر کدام با اولین کلیک ساخته می‌شود
+        self.add_button(label=LearningMenuMessage.LABEL, callback=async_partial(self._open_submenu, LearningMenuMessage))
+        self.add_button(label=ServicesMenuMessage.LABEL, callback=async_partial(self._open_submenu, ServicesMenuMessage))
+        self.add_button(label=ContactMenuMessage.LABEL, callback=async_partial(self._open_submenu, ContactMenuMessage))
 
-        if isinstance(message_args, list):
-            message_args.append(self.app_update_display)
+        self._register(message_args)
 
-    async def app_update_display(self) -> None:
-        edited = await self.edit_message()
-        if edited:
-            self.is_alive()
 
-    def update(self) -> str:
-        return "🌍💳 Asll Pay | اصل پی 💳🌍\n\nبه ربات اصل‌پی خوش‌آمدید!\nخدمات را از منوی زیر انتخاب کنید."
+_fanout_log = logging.getLogger(__name__)
+
+
+async def fanout_updates(callbacks: List[Callable]) -> None:
+    """همه‌ی update_callbackها را هم‌زمان اجرا می‌کند (به‌جای حلقه‌ی for با await پشت‌سرهم).
+
+    محدودکننده‌های نرخ در app_update_display جلوی عبور از سقف تلگرام را می‌گیرند؛
+    خطای یک callback (sync یا async) لاگ می‌شود و بقیه را متوقف نمی‌کند.
+    """
+    pending = []
+    for callback in callbacks:
+        if asyncio.iscoroutinefunction(callback):
+            pending.append(callback())
+            continue
+        try:
+            callback()
+        except Exception:
+            _fanout_log.exception("update callback %r failed", callback)
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            _fanout_log.error("update callback failed", exc_info=result)
+
+
+# (نام پکیج، سطح لاگ)؛ logger خود برنامه در init_logger با سطح DEBUG اضافه می‌شود
+_PACKAGES: Final = (
+    ("apscheduler", logging.WARNING),
+    ("telegram_menu", logging.INFO),
+)
+
+
+_LOG_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s [%(name)s] [%(levelname)s]  %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+)
 
 
 def init_logger(current_logger) -> Logger:
-    _packages: List[TypePackageLogger] = [
-        {"package": "apscheduler", "level": logging.WARNING},
-        {"package": "telegram_menu", "level": logging.DEBUG},
-        {"package": current_logger, "level": logging.DEBUG},
-    ]
-    log_formatter = logging.Formatter(
-        fmt="%(asctime)s [%(name)s] [%(levelname)s]  %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(log_formatter)
+    """Init logger.
+
+    telegram_menu روی INFO است؛ در کد خودمان از logger.debug("x=%s", x) استفاده کنید نه f-string،
+    تا وقتی سطح DEBUG خاموش است رشته اصلاً ساخته نشود (isEnabledFor زودتر برمی‌گردد).
+    """
     _logger = logging.getLogger(current_logger)
-    for _package in _packages:
-        _logger = logging.getLogger(_package["package"])
-        _logger.setLevel(_package["level"])
-        _logger.addHandler(console_handler)
-        _logger.propagate = False
+    # فقط loggerهای خودمان تنظیم می‌شوند، نه root؛ فراخوانی دوباره handler تکراری اضافه نمی‌کند
+    if _logger.handlers:
+        return _logger
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(_LOG_FORMATTER)
+    for name, level in _PACKAGES + ((current_logger, logging.DEBUG),):
+        package_logger = logging.getLogger(name)
+        package_logger.setLevel(level)
+        if not package_logger.handlers:
+            package_logger.addHandler(console_handler)
+        package_logger.propagate = False
     return _logger
@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-# asll_pay_menu.py — fixed order flow using BaseMessage callbacks (not callables)
+# asll_pay_menu.py — order flow with lazily built menus
 #
 # NOTE:
-# - This version aligns with the framework’s expected callback types:
-#   for buttons that should open a new UI, the callback is a BaseMessage INSTANCE
-#   (not a method). See models.py and navigation.py for how callbacks are handled.
-#   :contentReference[oaicite:0]{index=0}  :contentReference[oaicite:1]{index=1}
+# - زیرمنوها و صفحه‌ها با اولین فشردن دکمه ساخته و برای همان session کش می‌شوند (_LazyChildren).
+#   callback دکمه‌ها async_partial از telegram_menu است تا NavigationHandler آن را await کند.
 #
 # - "🛒 سفارش" now opens either:
 #     • an inline amount/region selector (for items needing a user amount/option), or
@@ -25,26 +23,32 @@
 
 import os
 import datetime
+import functools
+import itertools
 import logging
 import time
 import asyncio
+import bisect
 import html
-import re
+import sys
 import requests
+from collections import OrderedDict, deque
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from enum import IntEnum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Callable
-
-from telegram import ReplyKeyboardMarkup
+from typing import Any, Awaitable, ClassVar, Deque, Dict, List, NamedTuple, Optional, Set, Tuple, Callable
+from typing import OrderedDict as OrderedDictType
 
 from telegram.ext._callbackcontext import CallbackContext
 from telegram.ext._utils.types import BD, BT, CD, UD
 
-from telegram_menu import BaseMessage, MenuButton, ButtonType
+from telegram_menu import BaseMessage, MenuButton, ButtonType, async_partial
 from telegram_menu import NavigationHandler as _BaseNav  # type: ignore
 
 ROOT_FOLDER = Path(__file__).parent
+_RESOURCES_DIR: Path = ROOT_FOLDER.parent / "resources"
+_RESOURCES_DIR_STR = str(_RESOURCES_DIR)
 
 # ========= App Config =========
 ADMIN_USER = "@asll_pay"
@@ -53,35 +57,62 @@ ADMIN_CHAT_ID = 5375761406        # ← همین عددی که دادی
 # ADMIN_CHAT_ID = 104101121        # ← همین عددی که دادی
 
 # ========= Pricing =========
-# strategy.type ∈ {"fixed","percent","psn_region","prepaid_tier","quote_needed"}
-PRICING: Dict[str, Dict[str, Any]] = {
+class Strat(IntEnum):
+    """strategy.type؛ عدد صحیح تا compute_total با یک ایندکس به handler درست برسد."""
+    FIXED = 0
+    PERCENT = 1
+    PSN = 2        # psn_region
+    PREPAID = 3    # prepaid_tier
+    QUOTE = 4      # quote_needed
+
+
+class PriceStrategy(NamedTuple):
+    """یک ورودی PRICING؛ فیلدها با attribute خوانده می‌شوند نه کلید dict."""
+    type: Strat
+    percent: float = 0.0   # برای PERCENT
+    amount: float = 0.0    # برای FIXED
+
+
+PRICING: Dict[str, PriceStrategy] = {
     # Gift Cards
-    "apple_gift":   {"type": "percent", "percent": 5.0},
-    "google_play":  {"type": "percent", "percent": 5.0},
-    "playstation":  {"type": "psn_region"},
-    "prepaid_card": {"type": "prepaid_tier"},
-    "other_gift":   {"type": "percent", "percent": 5.0},  # ← جدید: سایر گیفت‌کارت‌ها
+    "apple_gift":   PriceStrategy(Strat.PERCENT, percent=5.0),
+    "google_play":  PriceStrategy(Strat.PERCENT, percent=5.0),
+    "playstation":  PriceStrategy(Strat.PSN),
+    "prepaid_card": PriceStrategy(Strat.PREPAID),
+    "other_gift":   PriceStrategy(Strat.PERCENT, percent=5.0),  # ← جدید: سایر گیفت‌کارت‌ها
 
     # Accounts / Fixed
-    "paypal":       {"type": "fixed", "amount": 40.0},
-    "mastercard":   {"type": "fixed", "amount": 130.0},
-    "wirex":        {"type": "fixed", "amount": 150.0},
+    "paypal":       PriceStrategy(Strat.FIXED, amount=40.0),
+    "mastercard":   PriceStrategy(Strat.FIXED, amount=130.0),
+    "wirex":        PriceStrategy(Strat.FIXED, amount=150.0),
 
     # Payments / Receipts
-    "site_payment": {"type": "percent", "percent": 5.0},   # ← جدید: پرداخت در سایت مورد نظر (+۵٪)
-    "fx_to_rial":   {"type": "percent", "percent": 5.0},   # ← تغییر از quote_needed به +۵٪
+    "site_payment": PriceStrategy(Strat.PERCENT, percent=5.0),   # ← جدید: پرداخت در سایت مورد نظر (+۵٪)
+    "fx_to_rial":   PriceStrategy(Strat.PERCENT, percent=5.0),   # ← تغییر از quote_needed به +۵٪
 
     # Others require quote
-    "wise":         {"type": "quote_needed"},
-    "university_fee": {"type": "quote_needed"},
-    "saas_purchase":  {"type": "quote_needed"},
-    "flight_hotel":   {"type": "quote_needed"},
+    "wise":         PriceStrategy(Strat.QUOTE),
+    "university_fee": PriceStrategy(Strat.QUOTE),
+    "saas_purchase":  PriceStrategy(Strat.QUOTE),
+    "flight_hotel":   PriceStrategy(Strat.QUOTE),
 }
 
 
 COMMON_DENOMS_SMALL = [5, 10, 15, 20, 25, 30, 40, 50, 75, 100]
 PREPAID_DENOMS = [1, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100, 150, 200, 250]
 
+# برچسب دکمه‌های مبلغ یک بار ساخته می‌شود
+_LABELS_COMMON: Tuple[str, ...] = tuple(f"{d}$" for d in COMMON_DENOMS_SMALL)
+_LABELS_PREPAID: Tuple[str, ...] = tuple(f"{d}$" for d in PREPAID_DENOMS)
+
+
+def _denom_labels(denoms: List[int]) -> Tuple[str, ...]:
+    if denoms is COMMON_DENOMS_SMALL:
+        return _LABELS_COMMON
+    if denoms is PREPAID_DENOMS:
+        return _LABELS_PREPAID
+    return tuple(f"{d}$" for d in denoms)
+
 # ========= FX (USD→IRT) =========
 USD_API_URL = "https://brsapi.ir/Api/Market/Gold_Currency.php?key=BgbF9eDYAMyKLqm5haWIW82faLae6Xca"
 USD_HEADERS = {
@@ -92,15 +123,20 @@ USD_HEADERS = {
     )
 }
 _USD_CACHE = {"ts": 0, "rate": None}  # تومان بر هر 1 USD (با 1.3% اضافه)
+# Session مشترک (keep-alive)؛ هر بار که کش منقضی شد اتصال جدید ساخته نمی‌شود
+_USD_SESSION = requests.Session()
+_USD_SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"],
+)))
 
 # — normalize & parse for manual amount input —
-_PERSIAN_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789")
-_ARABIC_DIGITS  = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
+# ارقام فارسی و عربی → لاتین در یک جدول (یک translate به‌جای دو)
+_FA_AR_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩", "01234567890123456789")
 
 def _normalize_digits(s: str) -> str:
     # تبدیل ارقام فارسی/عربی به لاتین + یکدست‌سازی جداکننده‌ها
     s = (s or "").strip()
-    s = s.translate(_PERSIAN_DIGITS).translate(_ARABIC_DIGITS)
+    s = s.translate(_FA_AR_DIGITS)
     # حذف کاراکترهای پرکاربرد در متن‌های فارسی
     s = s.replace(",", "").replace("٬", "").replace("،", "").replace(" ", "")
     s = s.replace("تومان", "").replace("تومن", "").replace("tmn", "").replace("IRT", "")
@@ -139,11 +175,8 @@ def _fetch_usd_irt_rate(markup_pct: float = 1.3, cache_sec: int = 120) -> Option
     if _USD_CACHE["rate"] and now - _USD_CACHE["ts"] < cache_sec:
         return _USD_CACHE["rate"]
 
-    sess = requests.Session()
-    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
-    sess.mount("https://", HTTPAdapter(max_retries=retry))
     try:
-        resp = sess.get(USD_API_URL, headers=USD_HEADERS, timeout=8)
+        resp = _USD_SESSION.get(USD_API_URL, headers=USD_HEADERS, timeout=8)
         if resp.status_code != 200:
             return _USD_CACHE["rate"]  # از کش برگرده اگر داشتیم
         data = resp.json()
@@ -164,7 +197,11 @@ def _usd_to_irt(amount_usd: Optional[float]) -> Optional[float]:
     rate = _fetch_usd_irt_rate()
     return (amount_usd * rate) if rate else None
 
+@functools.lru_cache(maxsize=256)
 def _fmt_usd(amount: float) -> str:
+    # مبالغ رایج (اعداد صحیح زیر ۱۰۰۰) بدون format-spec کامل
+    if 0 <= amount < 1000 and amount == int(amount):
+        return f"${int(amount)}.00"
     return f"${amount:,.2f}"
 
 
@@ -176,6 +213,12 @@ def _calc_discount(amount: float, pct: float) -> float:
     return round(amount * (1.0 - pct / 100.0), 2)
 
 
+# سقف هر پلّه (شامل) و درصد کارمزد آن؛ یک درصد بیشتر برای بالای آخرین سقف
+_PREPAID_THRESHOLDS = (20, 50, 100, 200)
+_PREPAID_PCTS = (10.0, 9.0, 8.0, 6.0, 5.0)
+
+
+@functools.lru_cache(maxsize=64)
 def _prepaid_tier(amount: float) -> float:
     """Tier:
       <=20 → +10%
@@ -184,58 +227,309 @@ def _prepaid_tier(amount: float) -> float:
       <=200 → +6%
       >200 → +5%
     """
-    if amount <= 20:
-        pct = 10.0
-    elif amount <= 50:
-        pct = 9.0
-    elif amount <= 100:
-        pct = 8.0
-    elif amount <= 200:
-        pct = 6.0
-    else:
-        pct = 5.0
+    pct = _PREPAID_PCTS[bisect.bisect_left(_PREPAID_THRESHOLDS, amount)]
     return _calc_percent(amount, pct)
 
 
+_US_REGION_ALIASES = frozenset({"us", "usa", "america", "united states", "🇺🇸", "امریکا", "آمریکا"})
+
+
+# کدهایی که AmountSelectorInline می‌فرستد؛ بدون lower() مستقیم نگاشت می‌شوند
+_REGION_CODES: Dict[str, str] = {"US": "us", "OTHER": "other"}
+
+
+def _canonical_region(region: Optional[str]) -> Optional[str]:
+    # همه‌ی نام‌های آمریکا → "us"؛ بقیه → "other"؛ بدون ریجن → None
+    if not region:
+        return None
+    code = _REGION_CODES.get(region)
+    if code is not None:
+        return code
+    if region.lower() in _US_REGION_ALIASES:
+        return "us"
+    return "other"
+
+
 def compute_total(service_key: str, base_amount: Optional[float] = None, region: Optional[str] = None) -> Tuple[Optional[float], str]:
     """Return (price_usd, note). If price_usd is None => quote needed."""
-    strat = PRICING.get(service_key, {"type": "quote_needed"})
-    t = strat["type"]
-
-    if t == "fixed":
-        return float(strat["amount"]), "قیمت ثابت"
-
-    if t == "percent":
-        if base_amount is None:
-            return None, "برای محاسبه قیمت، مبلغ دلاری لازم است."
-        pct = float(strat["percent"])
-        return _calc_percent(base_amount, pct), f"{pct}٪ کارمزد"
-
-    if t == "psn_region":
-        if base_amount is None:
-            return None, "برای محاسبه، مبلغ گیفت لازم است."
-        # US cheaper ~5%, others +5%
-        if (region or "").lower() in ["us", "usa", "america", "united states", "🇺🇸", "امریکا", "آمریکا"]:
-            return _calc_discount(base_amount, 5.0), "ریجن آمریکا ~۵٪ زیر قیمت اسمی"
-        else:
-            return _calc_percent(base_amount, 5.0), "سایر ریجن‌ها ~۵٪ بالاتر از اسمی"
+    return _compute_total_cached(service_key, base_amount, _canonical_region(region))
+
+
+def _total_fixed(strat: PriceStrategy, base_amount: Optional[float], region: Optional[str]) -> Tuple[Optional[float], str]:
+    return strat.amount, "قیمت ثابت"
+
+
+def _total_percent(strat: PriceStrategy, base_amount: Optional[float], region: Optional[str]) -> Tuple[Optional[float], str]:
+    if base_amount is None:
+        return None, "برای محاسبه قیمت، مبلغ دلاری لازم است."
+    pct = strat.percent
+    return _calc_percent(base_amount, pct), f"{pct}٪ کارمزد"
+
 
-    if t == "prepaid_tier":
-        if base_amount is None:
-            return None, "برای محاسبه، مبلغ شارژ لازم است."
-        return _prepaid_tier(base_amount), "کارمزد پلّه‌ای ۵٪ تا ۱۰٪"
+def _total_psn(strat: PriceStrategy, base_amount: Optional[float], region: Optional[str]) -> Tuple[Optional[float], str]:
+    if base_amount is None:
+        return None, "برای محاسبه، مبلغ گیفت لازم است."
+    # US cheaper ~5%, others +5%
+    if region == "us":
+        return _calc_discount(base_amount, 5.0), "ریجن آمریکا ~۵٪ زیر قیمت اسمی"
+    return _calc_percent(base_amount, 5.0), "سایر ریجن‌ها ~۵٪ بالاتر از اسمی"
 
+
+def _total_prepaid(strat: PriceStrategy, base_amount: Optional[float], region: Optional[str]) -> Tuple[Optional[float], str]:
+    if base_amount is None:
+        return None, "برای محاسبه، مبلغ شارژ لازم است."
+    return _prepaid_tier(base_amount), "کارمزد پلّه‌ای ۵٪ تا ۱۰٪"
+
+
+def _total_quote(strat: PriceStrategy, base_amount: Optional[float], region: Optional[str]) -> Tuple[Optional[float], str]:
     return None, "نیاز به استعلام قیمت"
 
 
+# ترتیب باید با مقدارهای Strat یکی باشد
+_HANDLERS: Tuple[Callable[[PriceStrategy, Optional[float], Optional[str]], Tuple[Optional[float], str]], ...] = (
+    _total_fixed,
+    _total_percent,
+    _total_psn,
+    _total_prepaid,
+    _total_quote,
+)
+_QUOTE_STRATEGY = PriceStrategy(Strat.QUOTE)
+
+# service_key → handler با strategy از پیش بسته‌شده؛ یک بار هنگام import
+_ServiceCompute = Callable[[Optional[float], Optional[str]], Tuple[Optional[float], str]]
+_SERVICE_COMPUTE: Dict[str, _ServiceCompute] = {
+    key: functools.partial(_HANDLERS[strat.type], strat) for key, strat in PRICING.items()
+}
+_QUOTE_COMPUTE: _ServiceCompute = functools.partial(_total_quote, _QUOTE_STRATEGY)
+
+
+@functools.lru_cache(maxsize=512)
+def _compute_total_cached(service_key: str, base_amount: Optional[float], region: Optional[str]) -> Tuple[Optional[float], str]:
+    # ورودی‌ها گسسته و محدودند (مبالغ × ریجن × سرویس)، پس نتیجه کش می‌شود
+    return _SERVICE_COMPUTE.get(service_key, _QUOTE_COMPUTE)(base_amount, region)
+
+
+# ========= Order targets =========
+# Strat → (نوع هدف سفارش، مبالغ پیشنهادی، پرسیدن ریجن)
+_QUOTE_SPEC: Tuple[str, List[int], bool] = ("quote", [], False)
+_TARGET_BY_STRATEGY: Dict[Strat, Tuple[str, List[int], bool]] = {
+    Strat.PERCENT: ("selector", COMMON_DENOMS_SMALL, False),
+    Strat.PSN:     ("selector", COMMON_DENOMS_SMALL, True),
+    Strat.PREPAID: ("selector", PREPAID_DENOMS, False),
+    Strat.FIXED:   ("fixed", [], False),
+}
+# یک بار هنگام import ساخته می‌شود؛ ProductDetailMessage فقط یک lookup انجام می‌دهد
+ORDER_TARGET_SPEC: Dict[str, Tuple[str, List[int], bool]] = {
+    key: _TARGET_BY_STRATEGY.get(strat.type, _QUOTE_SPEC) for key, strat in PRICING.items()
+}
+# (service_key, مبلغ دکمه، ریجن سلکتور) → (قیمت، توضیح)؛ همه‌ی حالت‌های دکمه‌ای هنگام import
+PRICE_TABLE: Dict[Tuple[str, float, Optional[str]], Tuple[Optional[float], str]] = {
+    (key, float(d), region): compute_total(key, float(d), region)
+    for key, (tag, denoms, region_prompt) in ORDER_TARGET_SPEC.items() if tag == "selector"
+    for region in ((None, "US", "OTHER") if region_prompt else (None,))
+    for d in denoms
+}
+# قیمت ثابت هیچ ورودی‌ای ندارد؛ یک بار هنگام import حساب می‌شود
+FIXED_PRICE_CACHE: Dict[str, Tuple[Optional[float], str]] = {
+    key: compute_total(key) for key, strat in PRICING.items() if strat.type is Strat.FIXED
+}
+
+
 # ========= Messages =========
+_BACK_LABEL: str = sys.intern("⬅️ بازگشت")
+_HOME_LABEL: str = sys.intern("🏠 خانه")
+
+
 class MyNavigationHandler(_BaseNav):
     """Optional extension if needed; kept for symmetry with the user's codebase."""
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # صف نوتیف ادمین و کش get_chat مال همین session‌اند (و با آن ساخته و دور ریخته می‌شوند)
+        self.admin_notifier = _AdminNotifier()
+        self.chat_users = _ChatUserCache()
+        # دکمه‌های «بازگشت» و «خانه» یک بار برای هر session ساخته و بین همه‌ی منوهای همان کاربر مشترک‌اند
+        self._back_btn = MenuButton(_BACK_LABEL, callback=self.goto_back)
+        self._home_btn = MenuButton(_HOME_LABEL, callback=self.goto_home)
+
     async def goto_back(self) -> int:
         return await self.select_menu_button("Back")
 
+
+class _NavTail:
+    """دکمه‌های مشترک «⬅️ بازگشت» و «🏠 خانه»ی همین session در انتهای کیبورد هر منو"""
+
+    # نام MenuButtonهای مشترک روی MyNavigationHandler، به ترتیب نمایش
+    _NAV_BUTTONS: ClassVar[Tuple[str, ...]] = ("_back_btn", "_home_btn")
+
+    def _add_nav(self, navigation: MyNavigationHandler, new_row: bool = False) -> None:
+        """چینش ردیف‌ها مثل BaseMessage.add_button است؛ با new_row دکمه‌ها از ردیف تازه شروع می‌شوند."""
+        buttons_per_row = 2 if not self.inlined else 4
+        if not isinstance(self.keyboard, list) or not self.keyboard:
+            self.keyboard = [[]]
+        for index, attr in enumerate(self._NAV_BUTTONS):
+            btn = getattr(navigation, attr)
+            if (new_row and index == 0) or len(self.keyboard[-1]) == buttons_per_row:
+                self.keyboard.append([btn])
+            else:
+                self.keyboard[-1].append(btn)
+
+
+# ========= Admin notify queue =========
+_ADMIN_NOTIFY_MAXSIZE = 1000
+_notify_log = logging.getLogger(__name__)
+
+
+class _AdminNotifier:
+    """
+    صف نوتیف‌های ادمین یک session: jobها با یک worker و به ترتیب فرستاده می‌شوند (حداکثر یک درخواست هم‌زمان به تلگرام).
+    worker با اولین job در event loop جاری ساخته می‌شود و با خالی شدن صف تمام می‌شود،
+    پس به loop یا Application قبلی بند نیست و بعد از cancel شدن با job بعدی دوباره راه می‌افتد.
+    """
+
+    def __init__(self, maxsize: int = _ADMIN_NOTIFY_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._jobs: Deque[Callable[[], Awaitable[Any]]] = deque()
+        self._worker: Optional["asyncio.Task[None]"] = None
+        # jobهایی که به‌خاطر پر بودن صف خارج از نوبت فرستاده می‌شوند
+        self._overflow: Set["asyncio.Task[None]"] = set()
+
+    def enqueue(self, job: Callable[[], Awaitable[Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        if len(self._jobs) >= self.maxsize:
+            # نوتیف پرداخت نباید گم شود: به جای حذف، بدون صف (و بدون حفظ ترتیب) فرستاده می‌شود
+            _notify_log.warning("admin notification queue is full (%d); sending out of order", self.maxsize)
+            task = loop.create_task(self._run(job))
+            self._overflow.add(task)
+            task.add_done_callback(self._overflow.discard)
+            return
+        self._jobs.append(job)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """همه‌ی نوتیف‌های در صف را می‌فرستد؛ بعد از آن هیچ taskی از این صف باز نیست."""
+        while True:
+            if self._jobs and (self._worker is None or self._worker.done()):
+                # worker قبلی cancel شده: باقی‌مانده‌ی صف با worker تازه فرستاده می‌شود
+                self._worker = asyncio.get_running_loop().create_task(self._drain())
+            pending = [task for task in (self._worker, *self._overflow) if task is not None and not task.done()]
+            if not pending:
+                return
+            await asyncio.wait(pending)
+
+    async def _drain(self) -> None:
+        while self._jobs:
+            await self._run(self._jobs.popleft())
+
+    @staticmethod
+    async def _run(job: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await job()
+        except Exception:
+            _notify_log.exception("admin notification failed")
+
+
+# ========= Chat lookup cache =========
+_CHAT_TTL_SEC = 3600.0
+_CHAT_CACHE_MAX = 1024
+
+
+class _ChatUserCache:
+    """
+    (username_str, first_name) کاربرها برای پیام ادمین؛ get_chat برای هر کاربر حداکثر یک بار در ttl.
+    هر session کش و lockهای خودش را دارد، پس lockها در همان event loop همان session ساخته می‌شوند.
+    """
+
+    def __init__(self, ttl: float = _CHAT_TTL_SEC, maxsize: int = _CHAT_CACHE_MAX, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        # user_chat_id → (زمان دریافت, username_str, first_name)؛ به ترتیب زمان دریافت (قدیمی‌ترین اول)
+        self._entries: OrderedDictType[int, Tuple[float, str, Optional[str]]] = OrderedDict()
+        # فقط برای lookupهای در جریان؛ بعد از پایان lookup حذف می‌شود
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def _fresh(self, user_chat_id: int) -> Optional[Tuple[float, str, Optional[str]]]:
+        ent = self._entries.get(user_chat_id)
+        if ent is None or self._clock() - ent[0] >= self.ttl:
+            return None
+        return ent
+
+    def _put(self, user_chat_id: int, ent: Tuple[float, str, Optional[str]]) -> None:
+        """درج در کش؛ ورودی‌های منقضی از ابتدای صف حذف می‌شوند و اندازه به maxsize محدود است."""
+        self._entries[user_chat_id] = ent
+        self._entries.move_to_end(user_chat_id)
+        deadline = ent[0] - self.ttl
+        while self._entries:
+            oldest_id, oldest = next(iter(self._entries.items()))
+            if oldest[0] > deadline and len(self._entries) <= self.maxsize:
+                break
+            del self._entries[oldest_id]
+
+    async def resolve(self, bot, user_chat_id: Optional[int], user_first: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (username_str, user_first) برای پیام ادمین.
+        درخواست‌های هم‌زمان برای یک کاربر با یک lock به یک فراخوانی get_chat تبدیل می‌شوند.
+        """
+        if not user_chat_id:
+            return None, user_first
+
+        ent = self._fresh(user_chat_id)
+        if ent is None:
+            lock = self._locks.get(user_chat_id)
+            if lock is None:
+                lock = self._locks[user_chat_id] = asyncio.Lock()
+            try:
+                async with lock:
+                    ent = self._fresh(user_chat_id)
+                    if ent is None:
+                        try:
+                            chat = await bot.get_chat(user_chat_id)  # ← Chat(username=..., first_name=..., ...)
+                        except Exception:
+                            # اگر get_chat خطا داد، حداقل چیزی نشان بدهیم (خطا کش نمی‌شود)
+                            return "(unknown)", user_first or "کاربر"
+                        # chat.username بدون @ است
+                        username_str = f"@{chat.username}" if getattr(chat, "username", None) else "(no-username)"
+                        ent = (self._clock(), username_str, getattr(chat, "first_name", None))
+                        self._put(user_chat_id, ent)
+            finally:
+                # منتظرهای همین lock بعد از گرفتن آن کش را دوباره چک می‌کنند؛ lock نباید برای هر کاربر بماند
+                if self._locks.get(user_chat_id) is lock:
+                    del self._locks[user_chat_id]
+
+        return ent[1], user_first or ent[2]
+
+
+# ========= Admin message templates =========
+_ADMIN_GIFT_TMPL = (
+    "🔔 پرداخت ثبت شد\n"
+    "• سرویس: %s\n"
+    "• ریجن: %s\n"
+    "• مبلغ انتخابی: %s\n"
+    "• مبلغ پرداخت نهایی: %s\n"
+    "• کاربر: %s%s"
+)
+_ADMIN_GIFT_NOTE_TMPL = (
+    "🔔 پرداخت ثبت شد\n"
+    "• سرویس: %s\n"
+    "• ریجن: %s\n"
+    "• مبلغ انتخابی: %s\n"
+    "• مبلغ پرداخت نهایی: %s\n"
+    "• توضیح محاسبه: %s\n"
+    "• کاربر: %s%s"
+)
+_ADMIN_PAYMENT_TMPL = (
+    "🔔 پرداخت جدید ثبت شد\n"
+    "• سرویس: %s\n"
+    "• مبلغ: %s\n"
+    "• کاربر: %s%s"
+)
+# عنوان محصول‌ها و یادداشت‌های محاسبه مجموعه‌ی کوچک و ثابتی‌اند
+_escape_title = functools.lru_cache(maxsize=128)(html.escape)
+
+
 async def _notify_admin_giftcard(
-    bot,
+    navigation: "MyNavigationHandler",
     admin_chat_id: int,
     title: str,
     region_label: str,
@@ -245,19 +539,8 @@ async def _notify_admin_giftcard(
     user_chat_id: Optional[int],
     user_first: Optional[str] = None,
 ):
-    username_str = None
-    try:
-        if user_chat_id:
-            chat = await bot.get_chat(user_chat_id)
-            if getattr(chat, "username", None):
-                username_str = f"@{chat.username}"
-            else:
-                username_str = "(no-username)"
-            if not user_first:
-                user_first = getattr(chat, "first_name", None)
-    except Exception:
-        username_str = username_str or "(unknown)"
-        user_first = user_first or "کاربر"
+    bot = navigation._bot
+    username_str, user_first = await navigation.chat_users.resolve(bot, user_chat_id, user_first)
 
     if user_chat_id:
         user_link = f'<a href="tg://user?id={user_chat_id}">{html.escape(user_first or "کاربر")}</a>'
@@ -266,16 +549,12 @@ async def _notify_admin_giftcard(
         user_link = html.escape(user_first or "کاربر")
         user_tail = f" ({username_str})"
 
-    note_lines = [
-        "🔔 پرداخت ثبت شد",
-        f"• سرویس: {html.escape(title)}",
-        f"• ریجن: {region_label}",
-        f"• مبلغ انتخابی: {chosen_txt}",
-        f"• مبلغ پرداخت نهایی: {final_txt}",
-        f"• توضیح محاسبه: {html.escape(note_calc)}" if note_calc else "",
-        f"• کاربر: {user_link}{user_tail}",
-    ]
-    note_text = "\n".join([ln for ln in note_lines if ln])
+    if note_calc:
+        note_text = _ADMIN_GIFT_NOTE_TMPL % (
+            _escape_title(title), region_label, chosen_txt, final_txt, _escape_title(note_calc), user_link, user_tail,
+        )
+    else:
+        note_text = _ADMIN_GIFT_TMPL % (_escape_title(title), region_label, chosen_txt, final_txt, user_link, user_tail)
 
     await bot.send_message(
         chat_id=admin_chat_id,
@@ -285,7 +564,7 @@ async def _notify_admin_giftcard(
     )
 
 async def _notify_admin_payment(
-    bot,
+    navigation: "MyNavigationHandler",
     admin_chat_id: int,
     title: str,
     amount_txt: str,
@@ -293,24 +572,11 @@ async def _notify_admin_payment(
     user_first: Optional[str] = None,
 ):
     """
-    username واقعی کاربر را با get_chat می‌گیرد تا قطعاً کامل باشد (مثل Mahdi749574).
+    username واقعی کاربر را با get_chat (کش‌شده) می‌گیرد تا قطعاً کامل باشد (مثل Mahdi749574).
     سپس پیام کامل را برای ادمین می‌فرستد.
     """
-    username_str = None
-    try:
-        if user_chat_id:
-            chat = await bot.get_chat(user_chat_id)  # ← Chat(username=..., first_name=..., ...)
-            # chat.username بدون @ است؛ اگر None بود، لینک کاربر را می‌سازیم
-            if getattr(chat, "username", None):
-                username_str = f"@{chat.username}"
-            else:
-                username_str = "(no-username)"
-            if not user_first:
-                user_first = getattr(chat, "first_name", None)
-    except Exception:
-        # اگر get_chat خطا داد، حداقل چیزی نشان بدهیم
-        username_str = username_str or "(unknown)"
-        user_first = user_first or "کاربر"
+    bot = navigation._bot
+    username_str, user_first = await navigation.chat_users.resolve(bot, user_chat_id, user_first)
 
     # لینک کلیک‌پذیر به پروفایل تلگرام کاربر
     if user_chat_id:
@@ -320,12 +586,7 @@ async def _notify_admin_payment(
         user_link = html.escape(user_first or "کاربر")
         user_tail = f" ({username_str})"
 
-    note_text = (
-        "🔔 پرداخت جدید ثبت شد\n"
-        f"• سرویس: {html.escape(title)}\n"
-        f"• مبلغ: {amount_txt}\n"
-        f"• کاربر: {user_link}{user_tail}"
-    )
+    note_text = _ADMIN_PAYMENT_TMPL % (_escape_title(title), amount_txt, user_link, user_tail)
 
     await bot.send_message(
         chat_id=admin_chat_id,
@@ -334,6 +595,12 @@ async def _notify_admin_payment(
         disable_notification=False,
     )
 
+
+# برچسب دکمه‌های پرداخت؛ callbackها به خود پیام بسته‌اند پس فقط متن مشترک است
+_PAID_BTN: str = sys.intern("✅ واریز کردم")
+_NOT_PAID_BTN: str = sys.intern("⌛ هنوز واریز نکردم")
+
+
 class OrderSummaryMessage(BaseMessage):
     """
     خلاصه نهایی سفارش (برای تمام سرویس‌های غیر گیفت‌کارت).
@@ -341,6 +608,7 @@ class OrderSummaryMessage(BaseMessage):
     بعد از «واریز کردم» هیچ منوی اضافه‌ای (سفارش مجدد/تماس با ادمین) نشان داده نمی‌شود؛
     فقط پیام تأیید نمایش داده می‌شود و state در حالت خلاصه باقی می‌ماند تا کاربر دوباره همین مسیر را برود.
     """
+
     def __init__(
         self,
         navigation: MyNavigationHandler,
@@ -359,10 +627,28 @@ class OrderSummaryMessage(BaseMessage):
         self.base_amount = base_amount
         self.extra = extra
 
+        # بخش‌های ثابت متن خلاصه؛ بعد از ساخت پیام تغییر نمی‌کنند
+        head: List[str] = [f"<b>نهایی‌سازی سفارش — {title}</b>"]
+        if base_amount is not None:
+            head.append(f"مبلغ انتخابی: {_fmt_usd(base_amount)}")
+        if price_usd is not None:
+            head.append(f"<b>مبلغ پرداخت نهایی:</b> {_fmt_usd(price_usd)} ({note})")
+            tail = [
+                f"\n✅ لطفاً مبلغ فوق را به شماره‌حساب زیر به اسم هادوی واریز کنید:\n<b>{ACCOUNT_NO}</b>",
+                f"و سپس <b>رسید</b> را برای ادمین {ADMIN_USER} ارسال نمایید.",
+            ]
+        else:
+            head.append(f"⛳ {note}")
+            tail = [f"برای ادامه و استعلام دقیق، با ادمین {ADMIN_USER} در ارتباط باشید."]
+        self._head = "\n".join(head)
+        self._tail = "\n".join(tail)
+        # متن کامل بدون معادل تومانی (استعلامی یا وقتی نرخ در دسترس نیست)
+        self._rendered = f"{self._head}\n{self._tail}"
+
         # فقط همین دو دکمه مثل جریان گیفت‌کارت‌ها
         self.keyboard = [
-            [MenuButton("✅ واریز کردم", callback=self._mark_paid, btype=ButtonType.MESSAGE)],
-            [MenuButton("⌛ هنوز واریز نکردم", callback=self._not_paid)],
+            [MenuButton(_PAID_BTN, callback=self._mark_paid, btype=ButtonType.MESSAGE)],
+            [MenuButton(_NOT_PAID_BTN, callback=self._not_paid)],
         ]
 
     # ——— Actions: باید رشته برگردانند (برای inline buttons) ———
@@ -372,9 +658,10 @@ class OrderSummaryMessage(BaseMessage):
         user_chat_id = getattr(self.navigation, "chat_id", None)
         user_first   = getattr(self.navigation, "first_name", None) or getattr(self.navigation, "user_first_name", None)
 
-        # تسک async: username واقعی را می‌گیرد و پیام را برای ادمین می‌فرستد
-        asyncio.create_task(_notify_admin_payment(
-            self.navigation._bot,
+        # در صف نوتیف ادمین: username واقعی را می‌گیرد و پیام را برای ادمین می‌فرستد
+        self.navigation.admin_notifier.enqueue(functools.partial(
+            _notify_admin_payment,
+            self.navigation,
             ADMIN_CHAT_ID,
             self.title,
             amount_txt,
@@ -391,20 +678,22 @@ class OrderSummaryMessage(BaseMessage):
 
     # ——— Render ———
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        lines: List[str] = [f"<b>نهایی‌سازی سفارش — {self.title}</b>"]
-        if self.base_amount is not None:
-            lines.append(f"مبلغ انتخابی: {_fmt_usd(self.base_amount)}")
+        # فقط معادل تومانی به نرخ روز بستگی دارد؛ بقیه‌ی متن یک بار در __init__ ساخته شده
         if self.price_usd is not None:
-            lines.append(f"<b>مبلغ پرداخت نهایی:</b> {_fmt_usd(self.price_usd)} ({self.note})")
             _irt = _usd_to_irt(self.price_usd)
             if _irt:
-                lines.append(f"{_fmt_irt(_irt)} (معادل تومانی)")
-            lines.append(f"\n✅ لطفاً مبلغ فوق را به شماره‌حساب زیر به اسم هادوی واریز کنید:\n<b>{ACCOUNT_NO}</b>")
-            lines.append(f"و سپس <b>رسید</b> را برای ادمین {ADMIN_USER} ارسال نمایید.")
-        else:
-            lines.append(f"⛳ {self.note}")
-            lines.append(f"برای ادامه و استعلام دقیق، با ادمین {ADMIN_USER} در ارتباط باشید.")
-        return "\n".join(lines)
+                return "\n".join((self._head, f"{_fmt_irt(_irt)} (معادل تومانی)", self._tail))
+        return self._rendered
+
+
+_SELECTOR_PAY_TAIL = (
+    f"\n✅ لطفاً مبلغ فوق را به شماره‌حساب زیر واریز کنید:\n<b>{ACCOUNT_NO}</b>\n"
+    f"و سپس <b>رسید</b> را برای ادمین {ADMIN_USER} ارسال نمایید."
+)
+_SELECTOR_CONTACT_TAIL = "⛳ برای ادامه با ادمین در ارتباط باشید."
+# شمارنده‌ی یکتا برای label سلکتورها (دو سلکتور در یک ثانیه هم label یکسان نمی‌گیرند)
+_SELECTOR_IDS = itertools.count()
+
 
 class AmountSelectorInline(BaseMessage):
     """
@@ -424,12 +713,13 @@ class AmountSelectorInline(BaseMessage):
         default_region: Optional[str] = None,
         update_callback: Optional[List[Callable]] = None,
     ):
-        uniq = f"{service_key}:{default_region or 'ANY'}:{int(time.time())}"
+        uniq = f"{service_key}:{default_region or 'ANY'}:{next(_SELECTOR_IDS)}"
         super().__init__(navigation, label=f"amount_selector:{uniq}", inlined=True, notification=False)
 
         self.title = title
         self.service_key = service_key
         self.denoms = denoms
+        self._labels = _denom_labels(denoms)
         self.region_prompt = region_prompt
         self.region_selected: Optional[str] = default_region  # "US" | "OTHER" | None
 
@@ -438,6 +728,34 @@ class AmountSelectorInline(BaseMessage):
         self._mode: str = "pick"           # "pick" | "summary"
         self._price: Optional[float] = None
         self._note: str = ""
+        self._summary_head: str = ""
+        self._summary_tail: str = ""
+
+        # متن حالت انتخاب مبلغ برای هر ریجن (None / "US" / "OTHER") یک بار ساخته می‌شود
+        head = f"انتخاب مبلغ — {title}"
+        tail = "یکی از مبالغ متداول را انتخاب کنید یا راهنمای مبلغ دلخواه را بزنید."
+        if region_prompt:
+            self._texts: Dict[Optional[str], str] = {
+                None: "\n".join((head, "لطفاً ریجن را انتخاب کنید، سپس مبلغ را انتخاب کنید.", tail)),
+                "US": "\n".join((head, "ریجن: 🇺🇸 آمریکا (~۵٪ زیر قیمت اسمی)", tail)),
+                "OTHER": "\n".join((head, "ریجن: 🌍 سایر کشورها (~۵٪ بالاتر از اسمی)", tail)),
+            }
+        else:
+            self._texts = {None: head + "\n" + tail}
+
+        # ردیف‌های مبلغ و راهنمای مبلغ دلخواه ثابت‌اند؛ یک بار ساخته و بین کیبوردهای ریجن مشترک‌اند
+        self._amount_rows: List[List[MenuButton]] = self._build_amount_buttons()
+        self._custom_row: List[MenuButton] = [MenuButton(
+            "🔢 راهنمای مبلغ دلخواه",
+            callback=lambda: "اگر مبلغ موردنظر در لیست نیست، عدد دلاری را به صورت متنی ارسال کنید یا با ادمین "
+                             f"{ADMIN_USER} هماهنگ کنید."
+        )]
+        # کیبورد انتخاب مبلغ فقط به ریجن انتخاب‌شده بستگی دارد؛ برای هر ریجن یک بار ساخته می‌شود
+        self._keyboard_cache: Dict[Optional[str], List[List[MenuButton]]] = {}
+        self._summary_keyboard: List[List[MenuButton]] = [
+            [MenuButton(_PAID_BTN, callback=self._mark_paid, btype=ButtonType.MESSAGE)],
+            [MenuButton(_NOT_PAID_BTN, callback=self._not_paid)],
+        ]
 
         # ثبت update_callback تا بعد از هر اکشن بتونیم پیام رو refresh کنیم (مثل نمونه‌ی شما)
         self._update_callback = update_callback
@@ -459,16 +777,28 @@ class AmountSelectorInline(BaseMessage):
             return
 
         # تنظیم مبلغ انتخابی مثل دکمه‌های آماده
-        self.selected_amount = float(amt)
-        self._price, self._note = compute_total(
-            self.service_key,
-            base_amount=self.selected_amount,
-            region=self.region_selected if self.region_selected else None,
-        )
-        self._mode = "summary"
+        self._select_amount(float(amt))
         # رفرش UI با همون مکانیزم فعلی کلاس
         await self.app_update_display()
     
+    def _select_amount(self, amount: float) -> None:
+        """مبلغ را ثبت، قیمت را حساب و بخش‌های ثابت متن خلاصه را یک بار می‌سازد."""
+        self.selected_amount = amount
+        region = self.region_selected if self.region_selected else None
+        # دکمه‌های آماده از جدول از پیش حساب‌شده؛ مبلغ دلخواه با compute_total
+        priced = PRICE_TABLE.get((self.service_key, amount, region))
+        if priced is None:
+            priced = compute_total(self.service_key, base_amount=amount, region=region)
+        self._price, self._note = priced
+        head = f"<b>سفارش ثبت شد — {self.title}</b>\nمبلغ انتخابی: {_fmt_usd(amount)}"
+        if self._price is not None:
+            self._summary_head = f"{head}\n<b>مبلغ پرداخت نهایی:</b> {_fmt_usd(self._price)} ({self._note})"
+            self._summary_tail = _SELECTOR_PAY_TAIL
+        else:
+            self._summary_head = head
+            self._summary_tail = _SELECTOR_CONTACT_TAIL
+        self._mode = "summary"
+
     # ---- Callbacks: Region selection ----
     def _make_set_region_cb(self, region_code: str):
         def _cb() -> str:
@@ -480,13 +810,7 @@ class AmountSelectorInline(BaseMessage):
     # ---- Callbacks: pick amount → compute & go summary (return TEXT only) ----
     def _pick_amount_cb(self, amount: float):
         def _cb() -> str:
-            self.selected_amount = float(amount)
-            self._price, self._note = compute_total(
-                self.service_key,
-                base_amount=self.selected_amount,
-                region=self.region_selected if self.region_selected else None,
-            )
-            self._mode = "summary"
+            self._select_amount(float(amount))
             # یک متن کوتاه برای نوتیف؛ UI با app_update_display رفرش می‌شود
             return f"✅ {_fmt_usd(self.selected_amount)} شما وارد شد."
         return _cb
@@ -504,8 +828,9 @@ class AmountSelectorInline(BaseMessage):
         user_first   = getattr(self.navigation, "first_name", None) or getattr(self.navigation, "user_first_name", None)
 
         # نوتیف ادمین با جزئیات گیفت‌کارت (یا هر سرویس درصدی)
-        asyncio.create_task(_notify_admin_giftcard(
-            self.navigation._bot,
+        self.navigation.admin_notifier.enqueue(functools.partial(
+            _notify_admin_giftcard,
+            self.navigation,
             ADMIN_CHAT_ID,
             self.title,
             region_label,
@@ -550,9 +875,9 @@ class AmountSelectorInline(BaseMessage):
     def _build_amount_buttons(self) -> List[List[MenuButton]]:
         rows: List[List[MenuButton]] = []
         row: List[MenuButton] = []
-        for d in self.denoms:
+        for d, label in zip(self.denoms, self._labels):
             btn = MenuButton(
-                f"{d}$",
+                label,
                 callback=self._pick_amount_cb(float(d)),
                 btype=ButtonType.NOTIFICATION
             )
@@ -569,53 +894,32 @@ class AmountSelectorInline(BaseMessage):
         # حالت خلاصه‌ی سفارش
         if self._mode == "summary":
             # دکمه‌های پرداخت
-            self.keyboard = [
-                [MenuButton("✅ واریز کردم", callback=self._mark_paid, btype=ButtonType.MESSAGE)],
-                [MenuButton("⌛ هنوز واریز نکردم", callback=self._not_paid)],
-            ]
-            lines: List[str] = [f"<b>سفارش ثبت شد — {self.title}</b>"]
-            if self.selected_amount is not None:
-                lines.append(f"مبلغ انتخابی: {_fmt_usd(self.selected_amount)}")
+            self.keyboard = self._summary_keyboard
+            # متن ثابت در _select_amount ساخته شده؛ فقط معادل تومانی زنده است
             if self._price is not None:
-                lines.append(f"<b>مبلغ پرداخت نهایی:</b> {_fmt_usd(self._price)} ({self._note})")
                 _irt = _usd_to_irt(self._price)
                 if _irt:
-                    lines.append(f"{_fmt_irt(_irt)} (معادل تومانی)")
-                lines.append(f"\n✅ لطفاً مبلغ فوق را به شماره‌حساب زیر واریز کنید:\n<b>{ACCOUNT_NO}</b>")
-                lines.append(f"و سپس <b>رسید</b> را برای ادمین {ADMIN_USER} ارسال نمایید.")
-            else:
-                lines.append("⛳ برای ادامه با ادمین در ارتباط باشید.")
-            return "\n".join(lines)
+                    return f"{self._summary_head}\n{_fmt_irt(_irt)} (معادل تومانی)\n{self._summary_tail}"
+            return f"{self._summary_head}\n{self._summary_tail}"
 
         # حالت انتخاب مبلغ
-        keyboard: List[List[MenuButton]] = []
-        if self.region_prompt and not self.region_selected:
-            # انتخاب ریجن (دکمه‌ها «تابع» دارند که TEXT برمی‌گرداند)
-            keyboard.append([
-                MenuButton("🇺🇸 US", callback=self._make_set_region_cb("US")),
-                MenuButton("🌍 Other", callback=self._make_set_region_cb("OTHER")),
-            ])
-        # دکمه‌های مبلغ
-        keyboard.extend(self._build_amount_buttons())
-        # راهنمای مبلغ دلخواه
-        keyboard.append([MenuButton(
-            "🔢 راهنمای مبلغ دلخواه",
-            callback=lambda: "اگر مبلغ موردنظر در لیست نیست، عدد دلاری را به صورت متنی ارسال کنید یا با ادمین "
-                             f"{ADMIN_USER} هماهنگ کنید."
-        )])
+        keyboard = self._keyboard_cache.get(self.region_selected)
+        if keyboard is None:
+            keyboard = []
+            if self.region_prompt and not self.region_selected:
+                # انتخاب ریجن (دکمه‌ها «تابع» دارند که TEXT برمی‌گرداند)
+                keyboard.append([
+                    MenuButton("🇺🇸 US", callback=self._make_set_region_cb("US")),
+                    MenuButton("🌍 Other", callback=self._make_set_region_cb("OTHER")),
+                ])
+            # دکمه‌های مبلغ + راهنمای مبلغ دلخواه
+            keyboard.extend(self._amount_rows)
+            keyboard.append(self._custom_row)
+            self._keyboard_cache[self.region_selected] = keyboard
         self.keyboard = keyboard
 
-        # متن توضیحی
-        lines = [f"انتخاب مبلغ — {self.title}"]
-        if self.region_prompt:
-            if self.region_selected == "US":
-                lines.append("ریجن: 🇺🇸 آمریکا (~۵٪ زیر قیمت اسمی)")
-            elif self.region_selected == "OTHER":
-                lines.append("ریجن: 🌍 سایر کشورها (~۵٪ بالاتر از اسمی)")
-            else:
-                lines.append("لطفاً ریجن را انتخاب کنید، سپس مبلغ را انتخاب کنید.")
-        lines.append("یکی از مبالغ متداول را انتخاب کنید یا راهنمای مبلغ دلخواه را بزنید.")
-        return "\n".join(lines)
+        # متن توضیحی (از پیش ساخته‌شده برای هر حالت ریجن)
+        return self._texts.get(self.region_selected, self._texts[None])
 
 
 class ActionAppMessage(BaseMessage):
@@ -635,13 +939,41 @@ class ActionAppMessage(BaseMessage):
         return self.shared_content or "تعریف نشده"
 
 
+# ---------- Lazy children ----------
+class _LazyChildren:
+    """
+    زیرمنوها فقط با اولین کلیک ساخته می‌شوند و برای همین پیام (همین session) نگه داشته می‌شوند.
+    callback دکمه: async_partial(self._open_child, key, factory)
+    """
+    _children: Dict[str, BaseMessage]
+
+    async def _open_child(self, key: str, factory: Callable[[], BaseMessage], context: Optional[Any] = None) -> int:
+        # منو با goto_menu و پیام inlined (سلکتور مبلغ، خلاصه‌ی سفارش، جزئیات) مثل دکمه‌ی معمولی باز می‌شود
+        child = self._children.get(key)
+        if child is None:
+            child = factory()
+            self._children[key] = child
+        return await self.navigation.open_message(child, key, context)
+
+    def _product_button(self, navigation: MyNavigationHandler, key: str, display: str) -> None:
+        # متن‌ها هنگام import خوانده شده‌اند؛ صفحه‌ی محصول فقط با اولین کلیک ساخته می‌شود
+        def _build() -> BaseMessage:
+            desc, details = _PRELOADED_TEXTS[key]
+            return ProductDetailMessage(navigation, display, desc, details, service_key=key)
+        self.add_button(display, callback=async_partial(self._open_child, key, _build))
+
+
+_ORDER_BTN: str = "🛒 سفارش"
+_DETAILS_BTN: str = "اطلاعات تکمیلی"
+
+
 # ---------- Product Detail (menu level) ----------
-class ProductDetailMessage(BaseMessage):
+class ProductDetailMessage(_NavTail, _LazyChildren, BaseMessage):
     """
     Menu message describing a product/service with a '🛒 سفارش' button.
-    The '🛒 سفارش' button now points to a BaseMessage instance (NOT a method),
-    per framework expectations.
+    The order target (selector or summary) is built on the first '🛒 سفارش' tap.
     """
+
     def __init__(
         self,
         navigation: MyNavigationHandler,
@@ -654,38 +986,38 @@ class ProductDetailMessage(BaseMessage):
         self.title = title
         self.description = description
         self.details = details
-        self.service_key = (service_key or title.lower().replace(" ", "_")).strip()
+        # interned تا lookup در PRICE_TABLE / ORDER_TARGET_SPEC با مقایسه‌ی اشاره‌گر تمام شود
+        self.service_key = sys.intern((service_key or title.lower().replace(" ", "_")).strip())
 
-        # Build the correct "order target" as a BaseMessage instance
-        self._order_target = self._build_order_target()
+        self._children = {}
 
         # Buttons (menu-level)
-        # IMPORTANT: callback is a BaseMessage instance to open either an inline selector or an inline summary
-        self.add_button("🛒 سفارش", callback=self._order_target)
+        # سلکتور/خلاصه‌ی سفارش و پیام جزئیات فقط با اولین کلیک ساخته می‌شوند
+        self.add_button(_ORDER_BTN, callback=async_partial(self._open_child, _ORDER_BTN, self._build_order_target))
         if details:
-            # Use ActionAppMessage instead of btype=ButtonType.MESSAGE
-            self.add_button("اطلاعات تکمیلی", callback=ActionAppMessage(navigation, self.details))
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+            self.add_button(
+                _DETAILS_BTN,
+                callback=async_partial(self._open_child, _DETAILS_BTN, self._build_details_target),
+            )
+        self._add_nav(navigation)
 
     def _details_msg(self) -> str:
         return self.details or "—"
 
+    def _build_details_target(self) -> BaseMessage:
+        return ActionAppMessage(self.navigation, self.details)
+
     def _build_order_target(self) -> BaseMessage:
         key = self.service_key
-        strat = PRICING.get(key, {"type": "quote_needed"})["type"]
+        tag, denoms, region_prompt = ORDER_TARGET_SPEC.get(key, _QUOTE_SPEC)
 
         # Services needing user amount/options → inline selector
-        if strat == "percent":
-            return AmountSelectorInline(self.navigation, self.title, key, COMMON_DENOMS_SMALL, region_prompt=False)
-        if strat == "psn_region":
-            return AmountSelectorInline(self.navigation, self.title, key, COMMON_DENOMS_SMALL, region_prompt=True)
-        if strat == "prepaid_tier":
-            return AmountSelectorInline(self.navigation, self.title, key, PREPAID_DENOMS, region_prompt=False)
+        if tag == "selector":
+            return AmountSelectorInline(self.navigation, self.title, key, denoms, region_prompt=region_prompt)
 
         # Fixed-price service → inline final summary immediately
-        if strat == "fixed":
-            price, note = compute_total(key)
+        if tag == "fixed":
+            price, note = FIXED_PRICE_CACHE[key]
             return OrderSummaryMessage(self.navigation, self.title, price, note, key)
 
         # Quote needed
@@ -696,131 +1028,152 @@ class ProductDetailMessage(BaseMessage):
         return txt
 
 
-# ---------- Category Menus (menu level) ----------
-def _read_file_if_exists(path: Path) -> str:
-    return path.read_text(encoding="utf-8").strip() if path.exists() else ""
+def _scan_resources(folder: str) -> Dict[str, str]:
+    """همه‌ی *.txt های resources با یک پیمایش scandir؛ نام بدون پسوند → متن."""
+    texts: Dict[str, str] = {}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    with open(entry.path, encoding="utf-8") as f:
+                        texts[entry.name[:-4]] = f.read().strip()
+    except FileNotFoundError:
+        pass
+    return texts
+
 
+# یک بار هنگام import؛ ساخت منوها هیچ I/O دیسکی ندارد
+RESOURCE_CACHE: Dict[str, str] = _scan_resources(_RESOURCES_DIR_STR)
 
-def _load_text(resources_dir: Path, stem: str) -> Tuple[str, str]:
-    desc = _read_file_if_exists(resources_dir / f"{stem}_desc.txt") or "—"
-    details = _read_file_if_exists(resources_dir / f"{stem}_details.txt") or ""
+
+def _load_text(stem: str) -> Tuple[str, str]:
+    desc = RESOURCE_CACHE.get(f"{stem}_desc") or "—"
+    details = RESOURCE_CACHE.get(f"{stem}_details") or ""
     return desc, details
 
 
-class GiftCardsMenuMessage(BaseMessage):
+# ---------- Product tables (ثابت؛ یک بار هنگام import) ----------
+_GIFT_PRODUCTS: Tuple[Tuple[str, str], ...] = (
+    ("apple_gift", "Apple Gift Card"),
+    ("google_play", "Google Play"),
+    ("playstation", "PlayStation"),
+    ("prepaid_card", "Prepaid Master/Visa"),
+    ("other_gift", "سایر گیفت‌کارت‌ها ⭐"),  # ← جدید
+)
+
+_ACCOUNTS: Tuple[Tuple[str, str], ...] = (
+    ("paypal", "PayPal"),
+    ("wirex", "Wirex"),
+    ("mastercard", "MasterCard 🇹🇷"),
+    ("wise", "Wise (TransferWise)"),
+)
+
+_PAYMENTS: Tuple[Tuple[str, str], ...] = (
+    ("site_payment", "پرداخت در سایت مورد نظر"),   # ← جدید (درصدی +۵٪ با سِلکتور مبلغ)
+    ("fx_to_rial", "تبدیل درآمد ارزی به ریال"),    # ← تبدیل، درصدی +۵٪
+    # ("university_fee", "پرداخت شهریه دانشگاه"),
+    # ("saas_purchase", "خرید سرویس‌های SaaS"),
+    # ("flight_hotel", "بلیط هواپیما / هتل"),
+)
+
+# service_key → (desc, details)؛ فایل‌ها قبل از شروع event loop خوانده می‌شوند
+_PRELOADED_TEXTS: Dict[str, Tuple[str, str]] = {
+    key: _load_text(key) for table in (_GIFT_PRODUCTS, _ACCOUNTS, _PAYMENTS) for key, _ in table
+}
+
+
+class GiftCardsMenuMessage(_NavTail, _LazyChildren, BaseMessage):
     LABEL = "💳 گیفت‌کارت‌ها"
+    _PROMPT: ClassVar[str] = "یکی از گیفت‌کارت‌ها را انتخاب کنید:"
 
     def __init__(self, navigation: MyNavigationHandler):
         super().__init__(navigation, label=self.LABEL, notification=False)
-        resources = (ROOT_FOLDER.parent / "resources")
-
-        products = [
-            ("apple_gift", "Apple Gift Card"),
-            ("google_play", "Google Play"),
-            ("playstation", "PlayStation"),
-            ("prepaid_card", "Prepaid Master/Visa"),
-            ("other_gift", "سایر گیفت‌کارت‌ها ⭐"),  # ← جدید
-        ]
+        self._children = {}
 
-        for key, display in products:
-            desc, details = _load_text(resources, key)
-            self.add_button(
-                display,
-                callback=ProductDetailMessage(navigation, display, desc, details, service_key=key),
-            )
+        for key, display in _GIFT_PRODUCTS:
+            self._product_button(navigation, key, display)
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back, new_row=True)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation, new_row=True)
 
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "یکی از گیفت‌کارت‌ها را انتخاب کنید:"
+        return self._PROMPT
 
 
-class AccountsMenuMessage(BaseMessage):
+class AccountsMenuMessage(_NavTail, _LazyChildren, BaseMessage):
     LABEL = "🏦 حساب‌های بین‌المللی"
+    _PROMPT: ClassVar[str] = "کدام نوع حساب بین‌المللی را می‌خواهید؟"
 
     def __init__(self, navigation: MyNavigationHandler):
         super().__init__(navigation, label=self.LABEL, notification=False)
-        resources = (ROOT_FOLDER.parent / "resources")
+        self._children = {}
 
-        accounts = [
-            ("paypal", "PayPal"),
-            ("wirex", "Wirex"),
-            ("mastercard", "MasterCard 🇹🇷"),
-            ("wise", "Wise (TransferWise)"),
-        ]
-        for key, display in accounts:
-            desc, details = _load_text(resources, key)
-            self.add_button(display, callback=ProductDetailMessage(navigation, display, desc, details, service_key=key))
+        for key, display in _ACCOUNTS:
+            self._product_button(navigation, key, display)
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back, new_row=True)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation, new_row=True)
 
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "کدام نوع حساب بین‌المللی را می‌خواهید؟"
+        return self._PROMPT
 
 
-class PaymentsMenuMessage(BaseMessage):
+class PaymentsMenuMessage(_NavTail, _LazyChildren, BaseMessage):
     LABEL = "💵 پرداخت/دریافت ارزی"  # ← تغییر عنوان
+    _PROMPT: ClassVar[str] = "نوع پرداخت ارزی خود را انتخاب کنید:"
 
     def __init__(self, navigation: MyNavigationHandler):
         super().__init__(navigation, label=self.LABEL, notification=False)
-        resources = (ROOT_FOLDER.parent / "resources")
-
-        payments = [
-            ("site_payment", "پرداخت در سایت مورد نظر"),   # ← جدید (درصدی +۵٪ با سِلکتور مبلغ)
-            ("fx_to_rial", "تبدیل درآمد ارزی به ریال"),    # ← تبدیل، درصدی +۵٪
-            # ("university_fee", "پرداخت شهریه دانشگاه"),
-            # ("saas_purchase", "خرید سرویس‌های SaaS"),
-            # ("flight_hotel", "بلیط هواپیما / هتل"),
-        ]
-        for key, display in payments:
-            desc, details = _load_text(resources, key)
-            self.add_button(display, callback=ProductDetailMessage(navigation, display, desc, details, service_key=key))
+        self._children = {}
+
+        for key, display in _PAYMENTS:
+            self._product_button(navigation, key, display)
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back, new_row=True)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation, new_row=True)
 
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "نوع پرداخت ارزی خود را انتخاب کنید:"
+        return self._PROMPT
 
 
-class ServicesMenuMessage(BaseMessage):
+class ServicesMenuMessage(_NavTail, _LazyChildren, BaseMessage):
     LABEL = "خدمات ما 🛠️"
+    _PROMPT: ClassVar[str] = "خدمات اصلی اصل‌پی را ببینید:"
 
     def __init__(self, navigation: MyNavigationHandler):
         super().__init__(navigation, label=self.LABEL, notification=False)
-
-        self.add_button("💳 گیفت‌کارت‌ها", callback=GiftCardsMenuMessage(navigation))
-        self.add_button("🏦 حساب‌های بین‌المللی", callback=AccountsMenuMessage(navigation))
-        self.add_button("💵 پرداخت‌های ارزی", callback=PaymentsMenuMessage(navigation))
+        self._children = {}
+
+        self.add_button("💳 گیفت‌کارت‌ها", callback=async_partial(
+            self._open_child, "gift_cards", functools.partial(GiftCardsMenuMessage, navigation)))
+        self.add_button("🏦 حساب‌های بین‌المللی", callback=async_partial(
+            self._open_child, "accounts", functools.partial(AccountsMenuMessage, navigation)))
+        self.add_button("💵 پرداخت‌های ارزی", callback=async_partial(
+            self._open_child, "payments", functools.partial(PaymentsMenuMessage, navigation)))
         self.add_button(
             "✨ خدمات ویژه",
-            callback=ProductDetailMessage(
+            callback=async_partial(self._open_child, "special_services", functools.partial(
+                ProductDetailMessage,
                 navigation,
                 "خدمات ویژه",
                 "تبدیل درآمد، کارت مجازی و خدمات اختصاصی.",
                 "جزئیات خدمات ویژه به زودی اضافه می‌شود.",
                 service_key="special_services",
-            ),
+            )),
         )
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back, new_row=True)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation, new_row=True)
 
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "خدمات اصلی اصل‌پی را ببینید:"
+        return self._PROMPT
 
 
-class LearningMenuMessage(BaseMessage):
+class LearningMenuMessage(_NavTail, BaseMessage):
     LABEL = "آموزش و راهنما 📚"
+    _PROMPT: ClassVar[str] = "راهنماها و نکات امنیتی را مطالعه کنید."
 
     def __init__(self, navigation: MyNavigationHandler):
         super().__init__(navigation, label=self.LABEL, notification=False)
         self.add_button("آموزش خرید", callback=self._buy_guide, btype=ButtonType.MESSAGE)
         self.add_button("آموزش امنیت", callback=self._security_guide, btype=ButtonType.MESSAGE)
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation)
 
     def _buy_guide(self) -> str:
         return "برای خرید: سرویس را انتخاب کنید → «🛒 سفارش» → پرداخت و ارسال رسید به ادمین."
@@ -829,10 +1182,11 @@ class LearningMenuMessage(BaseMessage):
         return "نکته امنیتی: هرگز اطلاعات کامل کارت یا رمز یک‌بارمصرف را در چت عمومی ارسال نکنید."
 
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "راهنماها و نکات امنیتی را مطالعه کنید."
+        return self._PROMPT
 
-class ContactMenuMessage(BaseMessage):
+class ContactMenuMessage(_NavTail, BaseMessage):
     LABEL = "پشتیبانی 👤"
+    _PROMPT: ClassVar[str] = "راه‌های ارتباط با پشتیبانی را انتخاب کنید."
 
     def __init__(self, navigation: MyNavigationHandler):
         super().__init__(navigation, label=self.LABEL, notification=False)
@@ -841,33 +1195,43 @@ class ContactMenuMessage(BaseMessage):
         self.add_button("📞 تماس تلفنی", callback=ActionAppMessage(navigation,"☎️ برای تماس تلفنی با پشتیبانی با شماره 02188922939 تماس بگیرید."))
         self.add_button("💬 ارسال پیام به پشتیبانی", callback=ActionAppMessage(navigation,"💬 برای ارتباط با پشتیبانی در تلگرام به آیدی @Asll_pay پیام دهید."))
 
-        self.add_button(label="⬅️ بازگشت", callback=navigation.goto_back)
-        self.add_button(label="🏠 خانه", callback=navigation.goto_home)
+        self._add_nav(navigation)
         
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "راه‌های ارتباط با پشتیبانی را انتخاب کنید."
-class StartMessage(BaseMessage):
+        return self._PROMPT
+class StartMessage(_LazyChildren, BaseMessage):
     LABEL = "start"
+    _PROMPT: ClassVar[str] = "🌍💳 Asll Pay | اصل‌پی 💳🌍\n\nبه ربات اصل‌پی خوش آمدید!\nاز منو گزینه موردنظر را انتخاب کنید."
 
     def __init__(self, navigation: MyNavigationHandler, message_args: Optional[List[Any]] = None) -> None:
         super().__init__(navigation, label=self.LABEL, notification=True)
+        self._children = {}
 
-        self.add_button("آموزش و راهنما 📚", callback=LearningMenuMessage(navigation))
-        self.add_button("خدمات ما 🛠️", callback=ServicesMenuMessage(navigation))
-        self.add_button("پشتیبانی 👤", callback=ContactMenuMessage(navigation))
+        # هیچ زیرمنویی اینجا ساخته نمی‌شود؛ هر کدام با اولین کلیک ساخته می‌شود
+        self.add_button("آموزش و راهنما 📚", callback=async_partial(
+            self._open_child, "learning", functools.partial(LearningMenuMessage, navigation)))
+        self.add_button("خدمات ما 🛠️", callback=async_partial(
+            self._open_child, "services", functools.partial(ServicesMenuMessage, navigation)))
+        self.add_button("پشتیبانی 👤", callback=async_partial(
+            self._open_child, "contact", functools.partial(ContactMenuMessage, navigation)))
 
     def update(self, context: Optional[CallbackContext[BT, UD, CD, BD]] = None) -> str:
-        return "🌍💳 Asll Pay | اصل‌پی 💳🌍\n\nبه ربات اصل‌پی خوش آمدید!\nاز منو گزینه موردنظر را انتخاب کنید."
+        return self._PROMPT
+
+
+# ========= Logger helper (optional) =========
+_LOG_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s [%(name)s] [%(levelname)s]  %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+)
 
 
-# ========= Logger helper (optional, unchanged) =========
 def init_logger(current_logger: str) -> logging.Logger:
-    log_formatter = logging.Formatter(
-        fmt="%(asctime)s [%(name)s] [%(levelname)s]  %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(log_formatter)
     _logger = logging.getLogger(current_logger)
+    # فراخوانی دوباره (مثلاً بعد از restart) handler تکراری اضافه نمی‌کند
+    if _logger.handlers:
+        return _logger
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setFormatter(_LOG_FORMATTER)
     _logger.setLevel(logging.DEBUG)
     _logger.addHandler(console_handler)
     _logger.propagate = False
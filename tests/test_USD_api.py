@@ -1,6 +1,8 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import asyncio
+import importlib.util
+import time
+
+import httpx
 
 URL = "https://brsapi.ir/Api/Market/Gold_Currency.php?key=BgbF9eDYAMyKLqm5haWIW82faLae6Xca"
 
@@ -13,19 +15,55 @@ HEADERS = {
     )
 }
 
-def get_usd(url=URL, headers=HEADERS, timeout=10):
-    session = requests.Session()
-    retries = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-    )
-    session.mount("https://", HTTPAdapter(max_retries=retries))
+# HTTP/2 اختیاری است: فقط اگر پکیج h2 (httpx[http2]) نصب باشد روشن می‌شود، وگرنه HTTP/1.1 با keep-alive
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRIES = 3
+_BACKOFF_SEC = 1.0
+
+
+def new_client():
+    """
+    Client مشترک برای همه‌ی فراخوانی‌های get_usd تا اتصال TCP/TLS (keep-alive) دوباره استفاده شود؛
+    با async with ساخته و بسته شود. transport فقط خطاهای اتصال را retry می‌کند، کدهای وضعیت در _get_with_retry.
+    """
+    return httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(http2=_HTTP2, retries=3))
+
+
+async def _get_with_retry(client, url, headers, timeout):
+    resp = await client.get(url, headers=headers, timeout=timeout)
+    for attempt in range(_RETRIES):
+        if resp.status_code not in _RETRY_STATUSES:
+            break
+        # event loop (مثلاً ربات) در زمان backoff بلاک نمی‌شود
+        await asyncio.sleep(_BACKOFF_SEC * 2 ** attempt)
+        resp = await client.get(url, headers=headers, timeout=timeout)
+    return resp
+
+
+# نرخ در چند ثانیه عوض نمی‌شود؛ نتیجه‌ی موفق برای هر url کوتاه‌مدت نگه داشته می‌شود
+CACHE_TTL_SEC = 60
+_CACHE = {}  # url → (زمان دریافت, نتیجه)
 
+
+def _looks_like_usd(item):
+    return item.get("name_en", "").lower().startswith("us") or "دلار" in item.get("name", "")
+
+
+async def get_usd(client, url=URL, headers=HEADERS, timeout=10):
+    cached = _CACHE.get(url)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL_SEC:
+        return cached[1]
+    result = await _fetch_usd(client, url, headers, timeout)
+    if "error" not in result:
+        _CACHE[url] = (time.monotonic(), result)
+    return result
+
+
+async def _fetch_usd(client, url, headers, timeout):
     try:
-        resp = session.get(url, headers=headers, timeout=timeout)
-    except requests.exceptions.RequestException as e:
+        resp = await _get_with_retry(client, url, headers, timeout)
+    except httpx.HTTPError as e:
         return {"error": f"Network error: {e}"}
 
     if resp.status_code == 403:
@@ -40,14 +78,13 @@ def get_usd(url=URL, headers=HEADERS, timeout=10):
 
     # جستجو در بخش currency با اولویت symbol == "USD"
     currency_list = data.get("currency", [])
-    usd = next((it for it in currency_list if it.get("symbol") == "USD"), None)
+    # reversed: اگر symbol تکراری بود، مثل قبل اولین مورد انتخاب شود
+    by_symbol = {it.get("symbol"): it for it in reversed(currency_list)}
+    usd = by_symbol.get("USD")
 
-    # اگر با symbol پیدا نشد، تلاش دوم براساس name_en یا name
+    # اگر با symbol پیدا نشد، تلاش دوم (یک پیمایش) براساس name_en یا name
     if not usd:
-        usd = next(
-            (it for it in currency_list if it.get("name_en", "").lower().startswith("us") or it.get("name", "").find("دلار") != -1),
-            None,
-        )
+        usd = next((it for it in currency_list if _looks_like_usd(it)), None)
 
     if not usd:
         return {"error": "USD not found in response", "available_symbols": [it.get("symbol") for it in currency_list]}
@@ -72,8 +109,13 @@ def get_usd(url=URL, headers=HEADERS, timeout=10):
         "time": usd.get("time"),
     }
 
+async def _main():
+    async with new_client() as client:
+        return await get_usd(client)
+
+
 if __name__ == "__main__":
-    result = get_usd()
+    result = asyncio.run(_main())
     if "error" in result:
         print("خطا:", result["error"])
         if "body" in result:
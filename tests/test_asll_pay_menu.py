@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test asll_pay_menu menus and pricing without a Telegram connection."""
+
+import asyncio
+import types
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+
+from tests.asll_pay_menu import (
+    _ORDER_BTN,
+    COMMON_DENOMS_SMALL,
+    FIXED_PRICE_CACHE,
+    ORDER_TARGET_SPEC,
+    PREPAID_DENOMS,
+    PRICE_TABLE,
+    PRICING,
+    Strat,
+    AmountSelectorInline,
+    GiftCardsMenuMessage,
+    MyNavigationHandler,
+    ProductDetailMessage,
+    ServicesMenuMessage,
+    StartMessage,
+    _AdminNotifier,
+    _ChatUserCache,
+    _canonical_region,
+    _prepaid_tier,
+    compute_total,
+)
+
+# compute_total of the original dict-based PRICING, kept as reference for the table-driven pricing tests
+_BASELINE_PRICING: Dict[str, Dict[str, Any]] = {
+    "apple_gift": {"type": "percent", "percent": 5.0},
+    "google_play": {"type": "percent", "percent": 5.0},
+    "playstation": {"type": "psn_region"},
+    "prepaid_card": {"type": "prepaid_tier"},
+    "other_gift": {"type": "percent", "percent": 5.0},
+    "paypal": {"type": "fixed", "amount": 40.0},
+    "mastercard": {"type": "fixed", "amount": 130.0},
+    "wirex": {"type": "fixed", "amount": 150.0},
+    "site_payment": {"type": "percent", "percent": 5.0},
+    "fx_to_rial": {"type": "percent", "percent": 5.0},
+    "wise": {"type": "quote_needed"},
+    "university_fee": {"type": "quote_needed"},
+    "saas_purchase": {"type": "quote_needed"},
+    "flight_hotel": {"type": "quote_needed"},
+}
+
+
+def _baseline_prepaid_tier(amount: float) -> float:
+    """Prepaid tier of the original if/elif chain."""
+    if amount <= 20:
+        pct = 10.0
+    elif amount <= 50:
+        pct = 9.0
+    elif amount <= 100:
+        pct = 8.0
+    elif amount <= 200:
+        pct = 6.0
+    else:
+        pct = 5.0
+    return round(amount * (1.0 + pct / 100.0), 2)
+
+
+def _baseline_compute_total(
+    service_key: str, base_amount: Optional[float] = None, region: Optional[str] = None
+) -> Tuple[Optional[float], str]:
+    """Original compute_total, before the strategy table."""
+    strat = _BASELINE_PRICING.get(service_key, {"type": "quote_needed"})
+    t = strat["type"]
+    if t == "fixed":
+        return float(strat["amount"]), "قیمت ثابت"
+    if t == "percent":
+        if base_amount is None:
+            return None, "برای محاسبه قیمت، مبلغ دلاری لازم است."
+        pct = float(strat["percent"])
+        return round(base_amount * (1.0 + pct / 100.0), 2), f"{pct}٪ کارمزد"
+    if t == "psn_region":
+        if base_amount is None:
+            return None, "برای محاسبه، مبلغ گیفت لازم است."
+        if (region or "").lower() in ["us", "usa", "america", "united states", "🇺🇸", "امریکا", "آمریکا"]:
+            return round(base_amount * (1.0 - 5.0 / 100.0), 2), "ریجن آمریکا ~۵٪ زیر قیمت اسمی"
+        return round(base_amount * (1.0 + 5.0 / 100.0), 2), "سایر ریجن‌ها ~۵٪ بالاتر از اسمی"
+    if t == "prepaid_tier":
+        if base_amount is None:
+            return None, "برای محاسبه، مبلغ شارژ لازم است."
+        return _baseline_prepaid_tier(base_amount), "کارمزد پلّه‌ای ۵٪ تا ۱۰٪"
+    return None, "نیاز به استعلام قیمت"
+
+
+# مبالغ دکمه‌ها، یک مبلغ دستی اعشاری و بدون مبلغ
+_AMOUNTS: Tuple[Optional[float], ...] = (None, 12.5) + tuple(float(d) for d in sorted(set(COMMON_DENOMS_SMALL + PREPAID_DENOMS)))
+# کدهای سلکتور و نام‌های آزاد ریجن
+_REGIONS: Tuple[Optional[str], ...] = (None, "", "US", "OTHER", "us", "USA", "United States", "🇺🇸", "آمریکا", "TR")
+
+
+class _Scheduler:
+    """Scheduler stub, the expiry checker job is not needed here."""
+
+    def add_job(self, *args: Any, **kwargs: Any) -> None:
+        """Ignore the job."""
+
+
+class OfflineNavigationHandler(MyNavigationHandler):
+    """Navigation handler whose messages are recorded instead of being sent."""
+
+    def __init__(self) -> None:
+        """Init OfflineNavigationHandler class."""
+        super().__init__(None, types.SimpleNamespace(id=1, first_name="test"), _Scheduler())  # type: ignore
+        self.sent: List[str] = []
+
+    async def send_message(self, content: str, keyboard: Any = None, notification: bool = True) -> Any:
+        """Record the content and return a fake telegram message."""
+        self.sent.append(content)
+        return types.SimpleNamespace(message_id=len(self.sent))
+
+
+class TestLazyButtons(unittest.IsolatedAsyncioTestCase):
+    """Lazy buttons must open their menu on every supported python version (3.8+)."""
+
+    async def asyncSetUp(self) -> None:
+        """Open the start menu."""
+        self.navigation = OfflineNavigationHandler()
+        await self.navigation.goto_menu(StartMessage(self.navigation))
+
+    async def _press(self, label: str) -> None:
+        """Press a button of the current menu, the same way a user does."""
+        await self.navigation.select_menu_button(label)
+
+    async def test_open_sub_menus(self) -> None:
+        """Each lazy button builds its menu once and navigates to it."""
+        await self._press(ServicesMenuMessage.LABEL)
+        services = self.navigation._menu_queue[-1]
+        self.assertIsInstance(services, ServicesMenuMessage)
+
+        await self._press(GiftCardsMenuMessage.LABEL)
+        self.assertIsInstance(self.navigation._menu_queue[-1], GiftCardsMenuMessage)
+
+        await self._press("Apple Gift Card")
+        detail = self.navigation._menu_queue[-1]
+        self.assertIsInstance(detail, ProductDetailMessage)
+        self.assertEqual(detail.service_key, "apple_gift")
+
+        # inlined target is sent as an app message, the menu level does not change
+        await self._press(_ORDER_BTN)
+        self.assertIsInstance(self.navigation._message_queue[-1], AmountSelectorInline)
+        self.assertIs(self.navigation._menu_queue[-1], detail)
+
+        # the sub-menu is cached for the session, re-opening reuses the same object
+        await self.navigation.goto_home()
+        await self._press(ServicesMenuMessage.LABEL)
+        self.assertIs(self.navigation._menu_queue[-1], services)
+
+    async def test_nav_footer(self) -> None:
+        """Every menu of the session ends with the same back and home buttons."""
+        await self._press(ServicesMenuMessage.LABEL)
+        await self._press(GiftCardsMenuMessage.LABEL)
+        for menu in self.navigation._menu_queue[1:]:
+            with self.subTest(menu=type(menu).__name__):
+                footer = [btn for row in menu.keyboard for btn in row][-2:]
+                self.assertIs(footer[0], self.navigation._back_btn)
+                self.assertIs(footer[1], self.navigation._home_btn)
+        self.assertIsNot(OfflineNavigationHandler()._back_btn, self.navigation._back_btn)
+
+
+class TestAdminNotifier(unittest.IsolatedAsyncioTestCase):
+    """Admin notifications of a session are sent in order and never dropped."""
+
+    def _job(self, sent: List[int], n: int, delay: float = 0.0) -> Any:
+        """Admin notification job recording its number once sent."""
+
+        async def _send() -> None:
+            await asyncio.sleep(delay)
+            sent.append(n)
+
+        return _send
+
+    async def test_per_handler(self) -> None:
+        """Each navigation handler owns its queue."""
+        self.assertIsNot(OfflineNavigationHandler().admin_notifier, OfflineNavigationHandler().admin_notifier)
+
+    async def test_ordering(self) -> None:
+        """Jobs are sent one at a time in enqueue order, a failing job does not stop the queue."""
+        notifier = _AdminNotifier()
+        sent: List[int] = []
+
+        async def _fail() -> None:
+            raise RuntimeError("telegram down")
+
+        notifier.enqueue(self._job(sent, 0, 0.02))
+        with self.assertLogs("tests.asll_pay_menu", "ERROR"):
+            notifier.enqueue(_fail)
+            for n in range(1, 5):
+                notifier.enqueue(self._job(sent, n))
+            await notifier.stop()
+        self.assertEqual(sent, [0, 1, 2, 3, 4])
+        self.assertTrue(notifier._worker.done())
+
+    async def test_queue_full(self) -> None:
+        """A job enqueued on a full queue is sent out of order instead of being dropped."""
+        notifier = _AdminNotifier(maxsize=2)
+        sent: List[int] = []
+        notifier.enqueue(self._job(sent, 0, 0.02))
+        notifier.enqueue(self._job(sent, 1))
+        with self.assertLogs("tests.asll_pay_menu", "WARNING"):
+            notifier.enqueue(self._job(sent, 2))
+        await notifier.stop()
+        self.assertEqual(sorted(sent), [0, 1, 2])
+        self.assertEqual(sent[0], 2)
+
+    async def test_worker_restart(self) -> None:
+        """A cancelled worker is restarted by the next job and the pending jobs are still sent."""
+        notifier = _AdminNotifier()
+        sent: List[int] = []
+        notifier.enqueue(self._job(sent, 0, 10.0))
+        notifier.enqueue(self._job(sent, 1))
+        await asyncio.sleep(0)
+        notifier._worker.cancel()
+        await asyncio.wait([notifier._worker])
+
+        notifier.enqueue(self._job(sent, 2))
+        await notifier.stop()
+        # the job running while the worker was cancelled is lost, the queued ones are not
+        self.assertEqual(sent, [1, 2])
+
+
+class _Bot:
+    """Bot stub answering get_chat after a short delay, like the telegram API."""
+
+    def __init__(self) -> None:
+        """Init _Bot class."""
+        self.calls: List[int] = []
+
+    async def get_chat(self, chat_id: int) -> Any:
+        """Record the lookup."""
+        self.calls.append(chat_id)
+        await asyncio.sleep(0.01)
+        return types.SimpleNamespace(username=f"user{chat_id}", first_name=f"first{chat_id}")
+
+
+class TestChatUserCache(unittest.IsolatedAsyncioTestCase):
+    """get_chat lookups of the admin notifications are cached per session."""
+
+    async def asyncSetUp(self) -> None:
+        """Cache with a manual clock."""
+        self.now = 0.0
+        self.bot = _Bot()
+        self.cache = _ChatUserCache(ttl=60.0, maxsize=2, clock=lambda: self.now)
+
+    async def test_per_handler(self) -> None:
+        """Each navigation handler owns its cache."""
+        self.assertIsNot(OfflineNavigationHandler().chat_users, OfflineNavigationHandler().chat_users)
+
+    async def test_concurrent_lookups(self) -> None:
+        """Concurrent lookups of the same user run get_chat once."""
+        results = await asyncio.gather(*(self.cache.resolve(self.bot, 7, None) for _ in range(5)))
+        self.assertEqual(results, [("@user7", "first7")] * 5)
+        self.assertEqual(self.bot.calls, [7])
+        self.assertEqual(self.cache._locks, {})
+
+    async def test_ttl_expiry(self) -> None:
+        """A lookup older than the ttl is fetched again."""
+        await self.cache.resolve(self.bot, 7, None)
+        self.now = 59.0
+        self.assertEqual(await self.cache.resolve(self.bot, 7, "given"), ("@user7", "given"))
+        self.assertEqual(self.bot.calls, [7])
+        self.now = 60.0
+        await self.cache.resolve(self.bot, 7, None)
+        self.assertEqual(self.bot.calls, [7, 7])
+
+    async def test_eviction(self) -> None:
+        """The cache keeps at most maxsize users, oldest first."""
+        for chat_id in (1, 2, 3):
+            await self.cache.resolve(self.bot, chat_id, None)
+            self.now += 1.0
+        self.assertEqual(list(self.cache._entries), [2, 3])
+        await self.cache.resolve(self.bot, 1, None)
+        self.assertEqual(list(self.cache._entries), [3, 1])
+        self.assertEqual(self.bot.calls, [1, 2, 3, 1])
+
+    async def test_expired_eviction(self) -> None:
+        """Expired users are dropped on the next insert even below maxsize."""
+        cache = _ChatUserCache(ttl=60.0, maxsize=10, clock=lambda: self.now)
+        await cache.resolve(self.bot, 1, None)
+        self.now = 30.0
+        await cache.resolve(self.bot, 2, None)
+        self.now = 65.0
+        await cache.resolve(self.bot, 3, None)
+        self.assertEqual(list(cache._entries), [2, 3])
+
+
+class TestPricing(unittest.TestCase):
+    """compute_total must return what the original dict-based pricing returned."""
+
+    def test_baseline_table(self) -> None:
+        """Every PRICING key, region and denomination, plus an unknown service."""
+        self.assertEqual(set(PRICING), set(_BASELINE_PRICING))
+        for key in tuple(PRICING) + ("unknown_service",):
+            for region in _REGIONS:
+                for amount in _AMOUNTS:
+                    with self.subTest(key=key, amount=amount, region=region):
+                        self.assertEqual(
+                            compute_total(key, amount, region), _baseline_compute_total(key, amount, region)
+                        )
+
+    def test_pinned_values(self) -> None:
+        """A few literal prices, so that the reference above cannot drift with the code."""
+        for key, amount, region, price in (
+            ("apple_gift", 10.0, None, 10.5),
+            ("fx_to_rial", 75.0, None, 78.75),
+            ("playstation", 100.0, "US", 95.0),
+            ("playstation", 100.0, "OTHER", 105.0),
+            ("playstation", 100.0, None, 105.0),
+            ("prepaid_card", 250.0, None, 262.5),
+            ("paypal", None, None, 40.0),
+            ("wirex", 50.0, "US", 150.0),
+            ("wise", 50.0, None, None),
+        ):
+            with self.subTest(key=key, amount=amount, region=region):
+                self.assertEqual(compute_total(key, amount, region)[0], price)
+
+
+    def test_prepaid_tier_boundaries(self) -> None:
+        """Each tier ceiling is inclusive: exactly 20/50/100/200 keep the higher percent."""
+        for amount, price in (
+            (19.99, 21.99),
+            (20.0, 22.0),  # +10%
+            (20.01, 21.81),  # +9%
+            (49.99, 54.49),
+            (50.0, 54.5),  # +9%
+            (50.01, 54.01),  # +8%
+            (99.99, 107.99),
+            (100.0, 108.0),  # +8%
+            (100.01, 106.01),  # +6%
+            (199.99, 211.99),
+            (200.0, 212.0),  # +6%
+            (200.01, 210.01),  # +5%
+        ):
+            with self.subTest(amount=amount):
+                self.assertEqual(_prepaid_tier(amount), price)
+                self.assertEqual(_prepaid_tier(amount), _baseline_prepaid_tier(amount))
+                # int and float amounts share the cache entry and the price
+                if amount == int(amount):
+                    self.assertEqual(_prepaid_tier(int(amount)), price)
+
+
+    def test_canonical_region(self) -> None:
+        """Region names collapse to "us", "other" or None, the way the original PSN pricing compared them."""
+        for region, canonical in (
+            (None, None),
+            ("", None),
+            ("US", "us"),
+            ("OTHER", "other"),
+            ("us", "us"),
+            ("Us", "us"),
+            ("USA", "us"),
+            ("america", "us"),
+            ("United States", "us"),
+            ("UNITED STATES", "us"),
+            ("🇺🇸", "us"),
+            ("آمریکا", "us"),
+            ("امریکا", "us"),
+            # no strip(): the original lower() comparison did not match padded names either
+            (" us", "other"),
+            ("US ", "other"),
+            ("united  states", "other"),
+            ("other", "other"),
+            ("TR", "other"),
+            ("🌍", "other"),
+        ):
+            with self.subTest(region=region):
+                self.assertEqual(_canonical_region(region), canonical)
+                # the canonical form prices exactly like the raw region did
+                self.assertEqual(
+                    compute_total("playstation", 100.0, region), _baseline_compute_total("playstation", 100.0, region)
+                )
+
+
+    def test_precomputed_tables(self) -> None:
+        """PRICE_TABLE and FIXED_PRICE_CACHE hold exactly what compute_total returns for each button."""
+        expected_keys = {
+            (key, float(d), region)
+            for key, (tag, denoms, region_prompt) in ORDER_TARGET_SPEC.items()
+            if tag == "selector"
+            for region in ((None, "US", "OTHER") if region_prompt else (None,))
+            for d in denoms
+        }
+        self.assertEqual(set(PRICE_TABLE), expected_keys)
+        for (key, amount, region), priced in PRICE_TABLE.items():
+            with self.subTest(key=key, amount=amount, region=region):
+                self.assertEqual(priced, compute_total(key, amount, region))
+                self.assertEqual(priced, _baseline_compute_total(key, amount, region))
+
+        self.assertEqual(set(FIXED_PRICE_CACHE), {key for key, strat in PRICING.items() if strat.type is Strat.FIXED})
+        for key, priced in FIXED_PRICE_CACHE.items():
+            with self.subTest(key=key):
+                self.assertEqual(priced, compute_total(key))
+                self.assertEqual(priced, _baseline_compute_total(key))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test "asll_pay_menu copy 2" helpers without a Telegram connection."""
+
+import asyncio
+import importlib.util
+import types
+import unittest
+from pathlib import Path
+from typing import Any, List
+
+# the file name has spaces, it can not be imported with an import statement
+_SPEC = importlib.util.spec_from_file_location(
+    "tests.asll_pay_menu_copy_2", Path(__file__).with_name("asll_pay_menu copy 2.py")
+)
+copy2 = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(copy2)  # type: ignore
+
+
+class _Scheduler:
+    """Scheduler stub, the expiry checker job is not needed here."""
+
+    def add_job(self, *args: Any, **kwargs: Any) -> None:
+        """Ignore the job."""
+
+
+def _navigation() -> Any:
+    """Copy 2 navigation handler without bot."""
+    return copy2.MyNavigationHandler(None, types.SimpleNamespace(id=1, first_name="test"), _Scheduler())
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    """Message edits are limited per chat."""
+
+    async def test_per_handler(self) -> None:
+        """Each navigation handler owns its limiter, there is no module-wide one."""
+        self.assertIsNot(_navigation()._edit_limiter, _navigation()._edit_limiter)
+        self.assertFalse(any(isinstance(value, copy2._RateLimiter) for value in vars(copy2).values()))
+
+    async def test_rate_bound(self) -> None:
+        """At most max_rate entries start within any period."""
+        limiter = copy2._RateLimiter(3, 0.1)
+        loop = asyncio.get_running_loop()
+        stamps: List[float] = []
+
+        async def _edit() -> None:
+            async with limiter:
+                stamps.append(loop.time())
+
+        start = loop.time()
+        await asyncio.gather(*(_edit() for _ in range(9)))
+        self.assertEqual(len(stamps), 9)
+        # 9 entries at 3 per 0.1s need at least two full periods
+        self.assertGreaterEqual(stamps[-1] - start, 0.2 - 0.01)
+        for first, fourth in zip(stamps, stamps[3:]):
+            self.assertGreaterEqual(fourth - first, 0.1 - 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
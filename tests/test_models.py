@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2023 Armel Mevellec
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""Test telegram_menu models helpers."""
+
+import asyncio
+import unittest
+from typing import Any, List, Tuple
+
+from telegram_menu import async_partial
+from telegram_menu.models import call_function_EAFP
+
+
+class _Menu:
+    """Owner of an async callback, like a BaseMessage opening a sub-menu."""
+
+    def __init__(self) -> None:
+        """Init _Menu class."""
+        self.calls: List[Tuple[str, Any]] = []
+
+    async def open(self, key: str, context: Any = None) -> str:
+        """Record the call."""
+        self.calls.append((key, context))
+        return key
+
+
+class TestAsyncPartial(unittest.IsolatedAsyncioTestCase):
+    """async_partial must stay a coroutine function on every supported python version (3.8+)."""
+
+    async def test_coroutine_function(self) -> None:
+        """A bound async method with bound arguments is still detected as coroutine function."""
+        menu = _Menu()
+        self.assertTrue(asyncio.iscoroutinefunction(async_partial(menu.open, "services")))
+
+    async def test_call_function_EAFP(self) -> None:
+        """The callback is awaited, with and without the context argument."""
+        menu = _Menu()
+        callback = async_partial(menu.open, "services")
+        self.assertEqual(await call_function_EAFP(callback, "context"), "services")
+        self.assertEqual(await callback(), "services")
+        self.assertEqual(menu.calls, [("services", "context"), ("services", None)])
+
+    async def test_keywords(self) -> None:
+        """Bound keywords are passed and can be overridden at call time."""
+        menu = _Menu()
+        callback = async_partial(menu.open, context="bound")
+        self.assertEqual(await callback("gift"), "gift")
+        self.assertEqual(await callback("gift", context="call"), "gift")
+        self.assertEqual(menu.calls, [("gift", "bound"), ("gift", "call")])
+
+
+if __name__ == "__main__":
+    unittest.main()
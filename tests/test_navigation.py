@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2023 Armel Mevellec
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""Test telegram_menu navigation without a Telegram connection."""
+
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from typing import Any, List
+from unittest import mock
+
+from telegram_menu import BaseMessage, NavigationHandler, TelegramMenuSession
+
+
+class _Scheduler:
+    """Scheduler stub, the expiry checker job is not needed here."""
+
+    def add_job(self, *args: Any, **kwargs: Any) -> None:
+        """Ignore the job."""
+
+
+class OfflineNavigationHandler(NavigationHandler):
+    """Navigation handler whose messages are recorded instead of being sent."""
+
+    def __init__(self) -> None:
+        """Init OfflineNavigationHandler class."""
+        super().__init__(None, types.SimpleNamespace(id=1, first_name="test"), _Scheduler())  # type: ignore
+        self.sent: List[str] = []
+
+    async def send_message(self, content: str, keyboard: Any = None, notification: bool = True) -> Any:
+        """Record the content and return a fake telegram message."""
+        self.sent.append(content)
+        return types.SimpleNamespace(message_id=len(self.sent))
+
+
+class _Message(BaseMessage):
+    """Message whose content is its label."""
+
+    def update(self) -> str:
+        """Update message content."""
+        return self.label
+
+
+class TestSessionDefaults(unittest.TestCase):
+    """Application settings used by TelegramMenuSession."""
+
+    def test_connection_pool(self) -> None:
+        """The bot is built with the session pool size and pool timeout."""
+        builder = mock.MagicMock()
+        for method in ("token", "persistence", "arbitrary_callback_data", "connection_pool_size", "pool_timeout"):
+            getattr(builder, method).return_value = builder
+        with tempfile.TemporaryDirectory() as folder, mock.patch(
+            "telegram_menu.navigation.Application.builder", return_value=builder
+        ):
+            TelegramMenuSession("123:ABC", persistence_path=str(Path(folder) / "persistence"))
+        builder.connection_pool_size.assert_called_once_with(TelegramMenuSession.CONNECTION_POOL_SIZE)
+        builder.pool_timeout.assert_called_once_with(TelegramMenuSession.POOL_TIMEOUT)
+        self.assertEqual(TelegramMenuSession.CONNECTION_POOL_SIZE, 32)
+        self.assertEqual(NavigationHandler.CONNECTION_POOL_SIZE, TelegramMenuSession.CONNECTION_POOL_SIZE)
+
+
+
+class TestOpenMessage(unittest.IsolatedAsyncioTestCase):
+    """NavigationHandler.open_message opens a message like a button with this message as callback."""
+
+    async def asyncSetUp(self) -> None:
+        """Open the home menu, then a sub-menu."""
+        self.navigation = OfflineNavigationHandler()
+        self.home = _Message(self.navigation, "home")
+        self.sub_menu = _Message(self.navigation, "sub")
+        await self.navigation.goto_menu(self.home)
+        await self.navigation.goto_menu(self.sub_menu)
+
+    async def test_menu(self) -> None:
+        """A menu message is pushed on the menu queue."""
+        menu = _Message(self.navigation, "menu")
+        msg_id = await self.navigation.open_message(menu, "Menu")
+        self.assertEqual(msg_id, menu.message_id)
+        self.assertEqual(self.navigation._menu_queue, [self.home, self.sub_menu, menu])
+        self.assertEqual(self.navigation._message_queue, [])
+
+    async def test_inlined(self) -> None:
+        """An inlined message is sent as app message, the menu level does not change."""
+        action = _Message(self.navigation, "action", inlined=True)
+        msg_id = await self.navigation.open_message(action, "Action")
+        self.assertEqual(msg_id, action.message_id)
+        self.assertEqual(action.label, "action_Action")
+        self.assertEqual(self.navigation._message_queue, [action])
+        self.assertEqual(self.navigation._menu_queue, [self.home, self.sub_menu])
+
+    async def test_inlined_home_after(self) -> None:
+        """An inlined message with home_after is sent, then the home menu is displayed again."""
+        action = _Message(self.navigation, "action", inlined=True, home_after=True)
+        msg_id = await self.navigation.open_message(action, "Action")
+        self.assertEqual(self.navigation._message_queue, [action])
+        self.assertEqual(self.navigation._menu_queue, [self.home])
+        self.assertEqual(msg_id, self.home.message_id)
+        self.assertEqual(self.navigation.sent[-2:], ["action", "home"])
+
+    async def test_select_menu_button(self) -> None:
+        """A button with a BaseMessage callback is opened through open_message."""
+        action = _Message(self.navigation, "action", inlined=True)
+        self.sub_menu.add_button("Action", action)
+        with mock.patch.object(self.navigation, "open_message", wraps=self.navigation.open_message) as open_message:
+            await self.navigation.select_menu_button("Action")
+        open_message.assert_awaited_once_with(action, "Action", None)
+        self.assertEqual(self.navigation._message_queue, [action])
+
+
+if __name__ == "__main__":
+    unittest.main()